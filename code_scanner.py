@@ -1,26 +1,41 @@
 """Code scanning functionality for DataDog usage detection."""
 
 import os
+import re
 import time
 from pathlib import Path
-from typing import List, Dict, Generator, Optional, Any
+from typing import List, Dict, Generator, Optional, Any, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import fnmatch
 import chardet
 
 from models import DataDogFinding, ProjectInfo, ScanResults
-from detectors.detector_factory import DataDogDetectorFactory
+from detectors.detector_factory import get_factory
 from github_linker import GitHubLinker
 from config import ConfigManager
 
 
+# Keywords that make a file worth running the detectors over
+_DATADOG_KEYWORDS = [
+    'datadog', 'DD_RUM', 'browser-rum', 'browser-logs',
+    'addAction', 'addError', 'addTiming', 'datadogRum',
+    'datadogLogs', 'logger.info', 'logger.error'
+]
+_DATADOG_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _DATADOG_KEYWORDS)), re.IGNORECASE)
+_DATADOG_KEYWORDS_BYTES_RE = re.compile(_DATADOG_KEYWORDS_RE.pattern.encode('ascii'), re.IGNORECASE)
+
+
+# Below this many candidate files a process pool costs more to start than it saves
+_PROCESS_POOL_MIN_FILES = 64
+
+
 class CodeScanner:
     """Scans code repositories for DataDog usage."""
     
     def __init__(self, config, github_linker: GitHubLinker):
         self.config = config
         self.github_linker = github_linker
-        self.detector_factory = DataDogDetectorFactory(
+        self.detector_factory = get_factory(
             context_lines=config.scan.context_lines,
             detailed_extraction=config.output.data_extraction_detailed
         )
@@ -41,6 +56,9 @@ class CodeScanner:
             [{'type': p.project_type} for p in projects]
         )
         
+        # Detect every project's branch up front rather than one git call at a time
+        self.github_linker.prefetch_branches([p.path for p in projects])
+        
         # Scan all projects
         all_findings = []
         
@@ -101,7 +119,8 @@ class CodeScanner:
         
         return projects
     
-    def _is_project_root(self, path: Path) -> bool:
+    @staticmethod
+    def _is_project_root(path: Path) -> bool:
         """Check if a directory is a project root."""
         # Check for common project indicators
         indicators = [
@@ -132,29 +151,58 @@ class CodeScanner:
         # Get all files to scan
         files_to_scan = list(self._get_files_to_scan(project_path))
         
-        # Use thread pool for parallel scanning
-        max_workers = min(8, max(1, len(files_to_scan)))  # Ensure at least 1 worker
-        
         # Skip threading if no files to scan
         if len(files_to_scan) == 0:
             return findings
         
+        # Read and prefilter on threads; this part is I/O bound
+        max_workers = min(8, len(files_to_scan))
+        candidates = []
+        
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit file scanning tasks
             future_to_file = {
-                executor.submit(self._scan_file, file_path, project): file_path
+                executor.submit(self._load_candidate, file_path): file_path
                 for file_path in files_to_scan
             }
             
             # Collect results
             for future in as_completed(future_to_file):
                 file_path = future_to_file[future]
+                self.files_scanned += 1
                 try:
-                    file_findings = future.result()
-                    findings.extend(file_findings)
-                    self.files_scanned += 1
+                    content = future.result()
                 except Exception as e:
-                    print(f"Error scanning {file_path}: {e}")
+                    print(f"Error scanning file {file_path}: {e}")
+                    continue
+                if content:
+                    candidates.append((file_path, content))
+        
+        # Regex matching is CPU bound, so large batches go to a process pool
+        if len(candidates) < _PROCESS_POOL_MIN_FILES:
+            for file_path, content in candidates:
+                try:
+                    findings.extend(self._detect_in_content(file_path, content, project))
+                except Exception as e:
+                    print(f"Error scanning file {file_path}: {e}")
+            return findings
+        
+        tasks = []
+        task_files = []
+        for file_path, content in candidates:
+            try:
+                base_url = self._file_base_url(file_path, project)
+            except Exception as e:
+                print(f"Error scanning file {file_path}: {e}")
+                continue
+            tasks.append((str(file_path), content, project.name, base_url))
+            task_files.append(file_path)
+        
+        results = self.detector_factory.detect_in_processes(tasks)
+        for file_path, file_findings in zip(task_files, results):
+            try:
+                findings.extend(self._add_line_urls(file_path, file_findings, project))
+            except Exception as e:
+                print(f"Error scanning file {file_path}: {e}")
         
         return findings
     
@@ -197,74 +245,87 @@ class CodeScanner:
     def _scan_file(self, file_path: Path, project: ProjectInfo) -> List[DataDogFinding]:
         """Scan a single file for DataDog usage."""
         try:
-            # Read file content with encoding detection
-            content = self._read_file_content(file_path)
-            
+            content = self._load_candidate(file_path)
             if not content:
                 return []
-            
-            # Quick check for DataDog-related content
-            if not self._has_datadog_content(content):
-                return []
-            
-            # Generate GitHub URL for this file
-            github_url = self.github_linker.generate_file_url(
-                str(file_path), 
-                1,  # Line number will be updated per finding
-                str(Path(project.path).parent),  # Scan root
-                project.path
-            )
-            
-            # Extract base GitHub URL for the file (without line number)
-            base_github_url = github_url.split('#')[0]
-            
-            # Get appropriate detector for this file
-            detector = self.detector_factory.get_detector_for_file(str(file_path))
-            if not detector:
-                return []  # No detector available for this file type
-            
-            # Detect DataDog usage
-            findings = detector.detect_datadog_usage(
-                str(file_path),
-                content,
-                project.name,
-                base_github_url
-            )
-            
-            # Update GitHub URLs with correct line numbers
-            for finding in findings:
-                finding.github_url = self.github_linker.generate_file_url(
-                    str(file_path),
-                    finding.line_number,
-                    str(Path(project.path).parent),
-                    project.path
-                )
-            
-            return findings
-            
+            return self._detect_in_content(file_path, content, project)
         except Exception as e:
             print(f"Error scanning file {file_path}: {e}")
             return []
     
+    def _load_candidate(self, file_path: Path) -> Optional[str]:
+        """Return the decoded content of a file worth detecting in, else None."""
+        raw_data = self._read_file_bytes(file_path)
+        
+        if not raw_data:
+            return None
+        
+        # Quick check on the raw bytes so most files are never decoded
+        if not self._has_datadog_content(raw_data):
+            return None
+        
+        # Decode with encoding detection
+        content = self._decode_content(file_path, raw_data)
+        
+        # Confirm against the decoded text
+        if not content or not self._has_datadog_content(content):
+            return None
+        
+        return content
+    
+    def _detect_in_content(self, file_path: Path, content: str,
+                           project: ProjectInfo) -> List[DataDogFinding]:
+        """Run the matching detector over already-loaded file content."""
+        # Get appropriate detector for this file
+        detector = self.detector_factory.get_detector_for_file(str(file_path))
+        if not detector:
+            return []  # No detector available for this file type
+        
+        # Detect DataDog usage
+        findings = detector.detect_datadog_usage(
+            str(file_path),
+            content,
+            project.name,
+            self._file_base_url(file_path, project)
+        )
+        
+        return self._add_line_urls(file_path, findings, project)
+    
+    def _file_base_url(self, file_path: Path, project: ProjectInfo) -> str:
+        """GitHub URL for a file, without a line anchor."""
+        github_url = self.github_linker.generate_file_url(
+            str(file_path), 
+            1,  # Line number will be updated per finding
+            str(Path(project.path).parent),  # Scan root
+            project.path
+        )
+        return github_url.split('#')[0]
+    
+    def _add_line_urls(self, file_path: Path, findings: List[DataDogFinding],
+                       project: ProjectInfo) -> List[DataDogFinding]:
+        """Point each finding's GitHub URL at its line."""
+        for finding in findings:
+            finding.github_url = self.github_linker.generate_file_url(
+                str(file_path),
+                finding.line_number,
+                str(Path(project.path).parent),
+                project.path
+            )
+        return findings
+    
     def _read_file_content(self, file_path: Path) -> Optional[str]:
         """Read file content with encoding detection."""
+        raw_data = self._read_file_bytes(file_path)
+        if raw_data is None:
+            return None
+        return self._decode_content(file_path, raw_data)
+    
+    @staticmethod
+    def _read_file_bytes(file_path: Path) -> Optional[bytes]:
+        """Read the raw bytes of a file."""
         try:
-            # Try UTF-8 first
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'rb') as f:
                 return f.read()
-        except UnicodeDecodeError:
-            # Detect encoding
-            try:
-                with open(file_path, 'rb') as f:
-                    raw_data = f.read()
-                    detected = chardet.detect(raw_data)
-                    encoding = detected.get('encoding', 'utf-8')
-                
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except:
-                print(f"Warning: Could not read file {file_path}")
-                return None
         except FileNotFoundError:
             print(f"Warning: File not found {file_path}")
             return None
@@ -272,16 +333,37 @@ class CodeScanner:
             print(f"Warning: Could not read file {file_path}: {e}")
             return None
     
-    def _has_datadog_content(self, content: str) -> bool:
-        """Quick check if content contains DataDog-related keywords."""
-        datadog_keywords = [
-            'datadog', 'DD_RUM', 'browser-rum', 'browser-logs',
-            'addAction', 'addError', 'addTiming', 'datadogRum',
-            'datadogLogs', 'logger.info', 'logger.error'
-        ]
+    @staticmethod
+    def _decode_content(file_path: Path, raw_data: bytes) -> Optional[str]:
+        """Decode file bytes, falling back to encoding detection."""
+        # Try UTF-8 first; chardet is only needed for the rare other encodings
+        try:
+            content = raw_data.decode('utf-8')
+        except UnicodeDecodeError:
+            try:
+                detected = chardet.detect(raw_data)
+                content = raw_data.decode(detected.get('encoding') or 'utf-8')
+            except:
+                print(f"Warning: Could not read file {file_path}")
+                return None
         
-        content_lower = content.lower()
-        return any(keyword.lower() in content_lower for keyword in datadog_keywords)
+        # Match text-mode reads, which translate all newline styles to '\n'
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    @staticmethod
+    def _has_datadog_content(content: Union[str, bytes]) -> bool:
+        """Quick check if content contains DataDog-related keywords.
+
+        Bytes are searched directly. Bytes containing NUL may be UTF-16 or
+        UTF-32, where the keywords are not contiguous, so they always pass.
+        """
+        if isinstance(content, bytes):
+            if b'\x00' in content:
+                return True
+            return _DATADOG_KEYWORDS_BYTES_RE.search(content) is not None
+        return _DATADOG_KEYWORDS_RE.search(content) is not None
     
     def get_scan_progress(self) -> Dict[str, Any]:
         """Get current scan progress."""
@@ -1,9 +1,14 @@
 """Configuration management for DataDog analyser."""
 
 import json
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, TextIO, Tuple
+from dataclasses import dataclass, field, fields
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -21,6 +26,8 @@ class GitHubConfig:
     base_url: str = "https://github.com/Volley-Inc"
     default_branch: str = "main"
     custom_path_mappings: Dict[str, str] = field(default_factory=dict)
+    branch_cache_path: Optional[str] = None  # e.g. "~/.cache/datadog-scanner/branches.json"
+    branch_cache_ttl: int = 1800  # seconds
     
     
 @dataclass
@@ -113,9 +120,13 @@ class ConfigManager:
         return 'unknown'
     
     @staticmethod
-    def get_ignore_patterns_for_project(project_type: str) -> List[str]:
-        """Get default ignore patterns for a project type."""
-        return ConfigManager.DEFAULT_IGNORE_PATTERNS.get(project_type, [])
+    @lru_cache(maxsize=None)
+    def get_ignore_patterns_for_project(project_type: str) -> Tuple[str, ...]:
+        """Get default ignore patterns for a project type.
+
+        Results are cached and shared between callers, hence an immutable tuple.
+        """
+        return tuple(ConfigManager.DEFAULT_IGNORE_PATTERNS.get(project_type, ()))
     
     @staticmethod
     def load_config(config_path: Optional[str] = None) -> AppConfig:
@@ -123,24 +134,50 @@ class ConfigManager:
         if config_path and Path(config_path).exists():
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                return AppConfig(**config_data)
+                    return ConfigManager._load_from_stream(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 pass
         
         return AppConfig()
     
+    @staticmethod
+    def _load_from_stream(fp: TextIO) -> AppConfig:
+        """Parse configuration JSON from an open text stream."""
+        config_data = json.load(fp)
+        return AppConfig(
+            scan=ConfigManager._build_section(ScanConfig, 'scan', config_data),
+            github=ConfigManager._build_section(GitHubConfig, 'github', config_data),
+            output=ConfigManager._build_section(OutputConfig, 'output', config_data)
+        )
+    
+    @staticmethod
+    def _build_section(config_cls, section: str, config_data: Dict):
+        """Build one sub-config, skipping and logging keys it does not define."""
+        known = {f.name for f in fields(config_cls)}
+        values = {}
+        for key, value in config_data.get(section, {}).items():
+            if key in known:
+                values[key] = value
+            else:
+                logger.warning("Ignoring unknown config key '%s.%s'", section, key)
+        return config_cls(**values)
+    
     @staticmethod
     def save_config(config: AppConfig, config_path: str) -> None:
         """Save configuration to file."""
+        with open(config_path, 'w', encoding='utf-8') as f:
+            ConfigManager._save_to_stream(config, f)
+    
+    @staticmethod
+    def _save_to_stream(config: AppConfig, fp: TextIO) -> None:
+        """Write configuration JSON to an open text stream."""
         config_dict = {
             'scan': config.scan.__dict__,
             'github': config.github.__dict__,
             'output': config.output.__dict__
         }
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_dict, f, indent=2)
+        json.dump(config_dict, fp, indent=2)
     
     @staticmethod
     def generate_github_url(project_name: str, base_url: str = "https://github.com/Volley-Inc") -> str:
@@ -5,7 +5,73 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
-from models import DataDogFinding, DataDogOperationType, DataCategory
+from models import (
+    DataDogFinding, DataDogOperationType, DataCategory,
+    OPERATION_VALUES, CATEGORY_VALUES
+)
+
+
+# Lowercase substrings that every detection and import pattern requires
+_QUICK_KEYWORDS = ('datadog', 'dd_rum', 'logger.')
+
+
+# Compiled once at import and shared by every detector instance
+_PATTERNS = {
+    # Import patterns
+    'imports': [
+        re.compile(r'import\s+.*@datadog/browser-rum', re.IGNORECASE),
+        re.compile(r'import\s+.*@datadog/browser-logs', re.IGNORECASE),
+        re.compile(r'import\s+.*@datadog/browser-rum-react', re.IGNORECASE),
+        re.compile(r'from\s+[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
+        re.compile(r'from\s+[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
+        re.compile(r'require\s*\(\s*[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
+        re.compile(r'require\s*\(\s*[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
+    ],
+
+    # Initialisation patterns
+    'init': [
+        re.compile(r'datadogRum\.init\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.createLogger\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.init\s*\(', re.IGNORECASE),
+    ],
+
+    # RUM patterns
+    'rum_action': [
+        re.compile(r'datadogRum\.addAction\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addAction\s*\(', re.IGNORECASE),
+    ],
+
+    'rum_error': [
+        re.compile(r'datadogRum\.addError\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addError\s*\(', re.IGNORECASE),
+    ],
+
+    'rum_timing': [
+        re.compile(r'datadogRum\.addTiming\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addTiming\s*\(', re.IGNORECASE),
+    ],
+
+    # Logging patterns
+    'log_info': [
+        re.compile(r'logger\.info\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.info\s*\(', re.IGNORECASE),
+    ],
+
+    'log_error': [
+        re.compile(r'logger\.error\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.error\s*\(', re.IGNORECASE),
+    ],
+
+    'log_warn': [
+        re.compile(r'logger\.warn\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.warn\s*\(', re.IGNORECASE),
+    ],
+
+    'log_debug': [
+        re.compile(r'logger\.debug\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.debug\s*\(', re.IGNORECASE),
+    ],
+}
 
 
 class DataDogDetector:
@@ -18,75 +84,27 @@ class DataDogDetector:
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Compile regex patterns for DataDog detection."""
-        self.patterns = {
-            # Import patterns
-            'imports': [
-                re.compile(r'import\s+.*@datadog/browser-rum', re.IGNORECASE),
-                re.compile(r'import\s+.*@datadog/browser-logs', re.IGNORECASE),
-                re.compile(r'import\s+.*@datadog/browser-rum-react', re.IGNORECASE),
-                re.compile(r'from\s+[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
-                re.compile(r'from\s+[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
-                re.compile(r'require\s*\(\s*[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
-                re.compile(r'require\s*\(\s*[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
-            ],
-            
-            # Initialisation patterns
-            'init': [
-                re.compile(r'datadogRum\.init\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.createLogger\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.init\s*\(', re.IGNORECASE),
-            ],
-            
-            # RUM patterns
-            'rum_action': [
-                re.compile(r'datadogRum\.addAction\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addAction\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_error': [
-                re.compile(r'datadogRum\.addError\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addError\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_timing': [
-                re.compile(r'datadogRum\.addTiming\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addTiming\s*\(', re.IGNORECASE),
-            ],
-            
-            # Logging patterns
-            'log_info': [
-                re.compile(r'logger\.info\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.info\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_error': [
-                re.compile(r'logger\.error\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.error\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_warn': [
-                re.compile(r'logger\.warn\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.warn\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_debug': [
-                re.compile(r'logger\.debug\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.debug\s*\(', re.IGNORECASE),
-            ],
-        }
+        """Use the module's precompiled detection patterns."""
+        self.patterns = _PATTERNS
     
     def detect_datadog_usage(self, file_path: str, content: str, 
-                           project_name: str, github_url: str) -> List[DataDogFinding]:
+                           project_name: str, github_url: str, *,
+                           lines: Optional[List[str]] = None) -> List[DataDogFinding]:
         """Detect DataDog usage in file content."""
+        # Every pattern needs one of these keywords, so most files can be skipped outright
+        content_lower = content.lower()
+        if not any(keyword in content_lower for keyword in _QUICK_KEYWORDS):
+            return []
+        
         findings = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         
         # Track processed lines to avoid duplicates
         processed_lines = set()
         
         # First pass: Extract imported DataDog methods
-        imported_methods = self._extract_imported_methods(content, file_path)
+        imported_methods = self._extract_imported_methods(content, file_path, lines)
         
         # Second pass: Find all DataDog usage patterns
         for line_num, line in enumerate(lines, 1):
@@ -327,11 +345,11 @@ class DataDogDetector:
         
         for finding in findings:
             # Count by operation type
-            op_type = finding.operation_type.value
+            op_type = OPERATION_VALUES[finding.operation_type]
             stats['by_operation_type'][op_type] = stats['by_operation_type'].get(op_type, 0) + 1
             
             # Count by data category
-            data_cat = finding.data_category.value
+            data_cat = CATEGORY_VALUES[finding.data_category]
             stats['by_data_category'][data_cat] = stats['by_data_category'].get(data_cat, 0) + 1
             
             # Count by project
@@ -346,10 +364,12 @@ class DataDogDetector:
         
         return stats
     
-    def _extract_imported_methods(self, content: str, file_path: str) -> Dict[str, Dict[str, str]]:
+    def _extract_imported_methods(self, content: str, file_path: str,
+                                  lines: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
         """Extract imported DataDog methods from file content."""
         imported_methods = {}
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         
         for line in lines:
             # Match various import patterns
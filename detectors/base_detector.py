@@ -32,8 +32,12 @@ class BaseDataDogDetector(ABC):
     
     @abstractmethod
     def detect_datadog_usage(self, file_path: str, content: str, 
-                           project_name: str, github_url: str) -> List[DataDogFinding]:
-        """Detect DataDog usage in file content."""
+                           project_name: str, github_url: str, *,
+                           lines: Optional[List[str]] = None) -> List[DataDogFinding]:
+        """Detect DataDog usage in file content.
+        
+        Callers that already hold content.split('\n') can pass it as lines.
+        """
         pass
     
     def can_handle_file(self, file_path: str) -> bool:
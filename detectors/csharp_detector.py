@@ -8,6 +8,102 @@ from models import DataDogFinding, DataDogOperationType, DataCategory
 from .base_detector import BaseDataDogDetector
 
 
+# Compiled once at import and shared by every detector instance
+_PATTERNS = {
+    # Using statements for DataDog
+    'imports': [
+        re.compile(r'using\s+Datadog\.Unity', re.IGNORECASE),
+        re.compile(r'using\s+Datadog\.Unity\.Rum', re.IGNORECASE),
+        re.compile(r'using\s+Datadog\.Unity\.Logs', re.IGNORECASE),
+        re.compile(r'using\s+Datadog\.Unity\.Core', re.IGNORECASE),
+    ],
+    
+    # SDK Initialization patterns
+    'init': [
+        re.compile(r'DatadogSdk\.InitWithPlatform\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.SetTrackingConsent\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.SetSdkVerbosity\s*\(', re.IGNORECASE),
+    ],
+    
+    # RUM patterns
+    'rum_action': [
+        re.compile(r'DatadogSdk\.Instance\.Rum\.(?:Add|Start)Action\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.Rum\.StopAction\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.(?:Add|Start)Action\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.StopAction\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_error': [
+        re.compile(r'DatadogSdk\.Instance\.Rum\.AddError\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.AddError\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_timing': [
+        re.compile(r'DatadogSdk\.Instance\.Rum\.AddTiming\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.AddTiming\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_view': [
+        re.compile(r'DatadogSdk\.Instance\.Rum\.StartView\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.Rum\.StopView\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.(?:Start|Stop)View\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_attribute': [
+        re.compile(r'DatadogSdk\.Instance\.Rum\.AddAttribute\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.Rum\.RemoveAttribute\s*\(', re.IGNORECASE),
+        re.compile(r'\.Rum\.(?:Add|Remove)Attribute\s*\(', re.IGNORECASE),
+    ],
+    
+    # Logging patterns
+    'log_create': [
+        re.compile(r'DatadogSdk\.Instance\.CreateLogger\s*\(', re.IGNORECASE),
+        re.compile(r'\.CreateLogger\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_info': [
+        re.compile(r'\.Log\s*\(\s*DdLogLevel\.Info', re.IGNORECASE),
+        re.compile(r'\.Info\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_error': [
+        re.compile(r'\.Log\s*\(\s*DdLogLevel\.Error', re.IGNORECASE),
+        re.compile(r'\.Error\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_warn': [
+        re.compile(r'\.Log\s*\(\s*DdLogLevel\.Warn', re.IGNORECASE),
+        re.compile(r'\.Warn\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_debug': [
+        re.compile(r'\.Log\s*\(\s*DdLogLevel\.Debug', re.IGNORECASE),
+        re.compile(r'\.Debug\s*\(', re.IGNORECASE),
+    ],
+    
+    # User and attribute management
+    'user_info': [
+        re.compile(r'DatadogSdk\.Instance\.SetUserInfo\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.AddUserExtraInfo\s*\(', re.IGNORECASE),
+        re.compile(r'\.SetUserInfo\s*\(', re.IGNORECASE),
+        re.compile(r'\.AddUserExtraInfo\s*\(', re.IGNORECASE),
+    ],
+    
+    'global_attributes': [
+        re.compile(r'DatadogSdk\.Instance\.AddLogsAttribute\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.AddLogsAttributes\s*\(', re.IGNORECASE),
+        re.compile(r'DatadogSdk\.Instance\.RemoveLogsAttribute\s*\(', re.IGNORECASE),
+        re.compile(r'\.(?:Add|Remove)LogsAttribute\s*\(', re.IGNORECASE),
+    ],
+    
+    # Utilities
+    'clear_data': [
+        re.compile(r'DatadogSdk\.Instance\.ClearAllData\s*\(', re.IGNORECASE),
+        re.compile(r'\.ClearAllData\s*\(', re.IGNORECASE),
+    ],
+}
+
+
 class CSharpDataDogDetector(BaseDataDogDetector):
     """Detects DataDog usage patterns in C# Unity files."""
     
@@ -20,106 +116,16 @@ class CSharpDataDogDetector(BaseDataDogDetector):
         return "C#"
     
     def _compile_patterns(self):
-        """Compile regex patterns for C# Unity DataDog detection."""
-        self.patterns = {
-            # Using statements for DataDog
-            'imports': [
-                re.compile(r'using\s+Datadog\.Unity', re.IGNORECASE),
-                re.compile(r'using\s+Datadog\.Unity\.Rum', re.IGNORECASE),
-                re.compile(r'using\s+Datadog\.Unity\.Logs', re.IGNORECASE),
-                re.compile(r'using\s+Datadog\.Unity\.Core', re.IGNORECASE),
-            ],
-            
-            # SDK Initialization patterns
-            'init': [
-                re.compile(r'DatadogSdk\.InitWithPlatform\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.SetTrackingConsent\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.SetSdkVerbosity\s*\(', re.IGNORECASE),
-            ],
-            
-            # RUM patterns
-            'rum_action': [
-                re.compile(r'DatadogSdk\.Instance\.Rum\.(?:Add|Start)Action\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.Rum\.StopAction\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.(?:Add|Start)Action\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.StopAction\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_error': [
-                re.compile(r'DatadogSdk\.Instance\.Rum\.AddError\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.AddError\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_timing': [
-                re.compile(r'DatadogSdk\.Instance\.Rum\.AddTiming\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.AddTiming\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_view': [
-                re.compile(r'DatadogSdk\.Instance\.Rum\.StartView\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.Rum\.StopView\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.(?:Start|Stop)View\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_attribute': [
-                re.compile(r'DatadogSdk\.Instance\.Rum\.AddAttribute\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.Rum\.RemoveAttribute\s*\(', re.IGNORECASE),
-                re.compile(r'\.Rum\.(?:Add|Remove)Attribute\s*\(', re.IGNORECASE),
-            ],
-            
-            # Logging patterns
-            'log_create': [
-                re.compile(r'DatadogSdk\.Instance\.CreateLogger\s*\(', re.IGNORECASE),
-                re.compile(r'\.CreateLogger\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_info': [
-                re.compile(r'\.Log\s*\(\s*DdLogLevel\.Info', re.IGNORECASE),
-                re.compile(r'\.Info\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_error': [
-                re.compile(r'\.Log\s*\(\s*DdLogLevel\.Error', re.IGNORECASE),
-                re.compile(r'\.Error\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_warn': [
-                re.compile(r'\.Log\s*\(\s*DdLogLevel\.Warn', re.IGNORECASE),
-                re.compile(r'\.Warn\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_debug': [
-                re.compile(r'\.Log\s*\(\s*DdLogLevel\.Debug', re.IGNORECASE),
-                re.compile(r'\.Debug\s*\(', re.IGNORECASE),
-            ],
-            
-            # User and attribute management
-            'user_info': [
-                re.compile(r'DatadogSdk\.Instance\.SetUserInfo\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.AddUserExtraInfo\s*\(', re.IGNORECASE),
-                re.compile(r'\.SetUserInfo\s*\(', re.IGNORECASE),
-                re.compile(r'\.AddUserExtraInfo\s*\(', re.IGNORECASE),
-            ],
-            
-            'global_attributes': [
-                re.compile(r'DatadogSdk\.Instance\.AddLogsAttribute\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.AddLogsAttributes\s*\(', re.IGNORECASE),
-                re.compile(r'DatadogSdk\.Instance\.RemoveLogsAttribute\s*\(', re.IGNORECASE),
-                re.compile(r'\.(?:Add|Remove)LogsAttribute\s*\(', re.IGNORECASE),
-            ],
-            
-            # Utilities
-            'clear_data': [
-                re.compile(r'DatadogSdk\.Instance\.ClearAllData\s*\(', re.IGNORECASE),
-                re.compile(r'\.ClearAllData\s*\(', re.IGNORECASE),
-            ],
-        }
+        """Use the module's precompiled C# Unity patterns."""
+        self.patterns = _PATTERNS
     
     def detect_datadog_usage(self, file_path: str, content: str, 
-                           project_name: str, github_url: str) -> List[DataDogFinding]:
+                           project_name: str, github_url: str, *,
+                           lines: Optional[List[str]] = None) -> List[DataDogFinding]:
         """Detect DataDog usage in C# Unity file content."""
         findings = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         
         # Track processed lines to avoid duplicates
         processed_lines = set()
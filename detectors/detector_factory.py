@@ -1,8 +1,11 @@
 """Factory for creating appropriate DataDog detectors based on file types."""
 
-from typing import List, Optional
-from pathlib import Path
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from models import DataDogFinding
 from .base_detector import BaseDataDogDetector
 from .typescript_detector import TypeScriptDataDogDetector
 from .csharp_detector import CSharpDataDogDetector
@@ -20,13 +23,29 @@ class DataDogDetectorFactory:
             TypeScriptDataDogDetector(context_lines, detailed_extraction),
             CSharpDataDogDetector(context_lines, detailed_extraction),
         ]
+        
+        # Lowercase extension -> detector; the first registered detector wins
+        self._ext_map: Dict[str, BaseDataDogDetector] = {}
+        for detector in self.detectors:
+            for extension in detector.get_supported_extensions():
+                self._ext_map.setdefault(extension.lower(), detector)
     
     def get_detector_for_file(self, file_path: str) -> Optional[BaseDataDogDetector]:
         """Get the appropriate detector for a given file."""
-        for detector in self.detectors:
-            if detector.can_handle_file(file_path):
-                return detector
-        return None
+        return self._ext_map.get(os.path.splitext(file_path)[1].lower())
+    
+    def detect_in_processes(self, tasks: Iterable[Tuple[str, str, str, str]],
+                            max_workers: Optional[int] = None,
+                            chunksize: int = 32) -> List[List[DataDogFinding]]:
+        """Run detection for many (file_path, content, project_name, github_url) tasks.
+        
+        Tasks are spread over a process pool, so regex matching is not bound by
+        the GIL. Results come back in task order. Each worker builds its own
+        factory with these settings.
+        """
+        scan = partial(_scan_one, self.context_lines, self.detailed_extraction)
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(scan, tasks, chunksize=chunksize))
     
     def get_all_detectors(self) -> List[BaseDataDogDetector]:
         """Get all available detectors."""
@@ -60,4 +79,28 @@ class DataDogDetectorFactory:
                 'extensions': detector.get_supported_extensions(),
                 'class_name': detector.__class__.__name__
             })
-        return info
\ No newline at end of file
+        return info
+
+
+@lru_cache(maxsize=None)
+def get_factory(context_lines: int = 3, detailed_extraction: bool = False) -> DataDogDetectorFactory:
+    """Return the shared factory for the given settings, creating it on first use.
+
+    Detectors keep no per-file state, so one factory can serve every scanner.
+    """
+    return DataDogDetectorFactory(context_lines, detailed_extraction)
+
+
+def _scan_one(context_lines: int, detailed_extraction: bool,
+              task: Tuple[str, str, str, str]) -> List[DataDogFinding]:
+    """Detect DataDog usage in one file's content; module-level so process pools can pickle it."""
+    file_path, content, project_name, github_url = task
+    detector = get_factory(context_lines, detailed_extraction).get_detector_for_file(file_path)
+    if detector is None:
+        return []
+    try:
+        return detector.detect_datadog_usage(file_path, content, project_name, github_url)
+    except Exception as e:
+        # One bad file must not abort the whole batch
+        print(f"Error scanning file {file_path}: {e}")
+        return []
@@ -8,6 +8,65 @@ from models import DataDogFinding, DataDogOperationType, DataCategory
 from .base_detector import BaseDataDogDetector
 
 
+# Compiled once at import and shared by every detector instance
+_PATTERNS = {
+    # Import patterns
+    'imports': [
+        re.compile(r'import\s+.*@datadog/browser-rum', re.IGNORECASE),
+        re.compile(r'import\s+.*@datadog/browser-logs', re.IGNORECASE),
+        re.compile(r'import\s+.*@datadog/browser-rum-react', re.IGNORECASE),
+        re.compile(r'from\s+[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
+        re.compile(r'from\s+[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
+        re.compile(r'require\s*\(\s*[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
+        re.compile(r'require\s*\(\s*[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
+    ],
+    
+    # Initialisation patterns
+    'init': [
+        re.compile(r'datadogRum\.init\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.createLogger\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.init\s*\(', re.IGNORECASE),
+    ],
+    
+    # RUM patterns
+    'rum_action': [
+        re.compile(r'datadogRum\.addAction\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addAction\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_error': [
+        re.compile(r'datadogRum\.addError\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addError\s*\(', re.IGNORECASE),
+    ],
+    
+    'rum_timing': [
+        re.compile(r'datadogRum\.addTiming\s*\(', re.IGNORECASE),
+        re.compile(r'DD_RUM\.addTiming\s*\(', re.IGNORECASE),
+    ],
+    
+    # Logging patterns
+    'log_info': [
+        re.compile(r'logger\.info\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.info\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_error': [
+        re.compile(r'logger\.error\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.error\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_warn': [
+        re.compile(r'logger\.warn\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.warn\s*\(', re.IGNORECASE),
+    ],
+    
+    'log_debug': [
+        re.compile(r'logger\.debug\s*\(', re.IGNORECASE),
+        re.compile(r'datadogLogs\.logger\.debug\s*\(', re.IGNORECASE),
+    ],
+}
+
+
 class TypeScriptDataDogDetector(BaseDataDogDetector):
     """Detects DataDog usage patterns in TypeScript/JavaScript files."""
     
@@ -20,69 +79,16 @@ class TypeScriptDataDogDetector(BaseDataDogDetector):
         return "TypeScript/JavaScript"
     
     def _compile_patterns(self):
-        """Compile regex patterns for TypeScript/JavaScript DataDog detection."""
-        self.patterns = {
-            # Import patterns
-            'imports': [
-                re.compile(r'import\s+.*@datadog/browser-rum', re.IGNORECASE),
-                re.compile(r'import\s+.*@datadog/browser-logs', re.IGNORECASE),
-                re.compile(r'import\s+.*@datadog/browser-rum-react', re.IGNORECASE),
-                re.compile(r'from\s+[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
-                re.compile(r'from\s+[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
-                re.compile(r'require\s*\(\s*[\'"]@datadog/browser-rum[\'"]', re.IGNORECASE),
-                re.compile(r'require\s*\(\s*[\'"]@datadog/browser-logs[\'"]', re.IGNORECASE),
-            ],
-            
-            # Initialisation patterns
-            'init': [
-                re.compile(r'datadogRum\.init\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.createLogger\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.init\s*\(', re.IGNORECASE),
-            ],
-            
-            # RUM patterns
-            'rum_action': [
-                re.compile(r'datadogRum\.addAction\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addAction\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_error': [
-                re.compile(r'datadogRum\.addError\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addError\s*\(', re.IGNORECASE),
-            ],
-            
-            'rum_timing': [
-                re.compile(r'datadogRum\.addTiming\s*\(', re.IGNORECASE),
-                re.compile(r'DD_RUM\.addTiming\s*\(', re.IGNORECASE),
-            ],
-            
-            # Logging patterns
-            'log_info': [
-                re.compile(r'logger\.info\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.info\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_error': [
-                re.compile(r'logger\.error\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.error\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_warn': [
-                re.compile(r'logger\.warn\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.warn\s*\(', re.IGNORECASE),
-            ],
-            
-            'log_debug': [
-                re.compile(r'logger\.debug\s*\(', re.IGNORECASE),
-                re.compile(r'datadogLogs\.logger\.debug\s*\(', re.IGNORECASE),
-            ],
-        }
+        """Use the module's precompiled TypeScript/JavaScript patterns."""
+        self.patterns = _PATTERNS
     
     def detect_datadog_usage(self, file_path: str, content: str, 
-                           project_name: str, github_url: str) -> List[DataDogFinding]:
+                           project_name: str, github_url: str, *,
+                           lines: Optional[List[str]] = None) -> List[DataDogFinding]:
         """Detect DataDog usage in TypeScript/JavaScript file content."""
         findings = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         
         # Track processed lines to avoid duplicates
         processed_lines = set()
@@ -0,0 +1,100 @@
+"""Fast command line parsing for the common invocation paths.
+
+Mirrors the options defined by main.create_argument_parser. Anything this
+parser does not fully understand (help, errors, unknown or abbreviated
+options) returns None so the caller can fall back to argparse for its
+messages and exit codes.
+"""
+
+from types import SimpleNamespace
+from typing import List, Optional
+
+# Option string -> (destination, kind)
+_FLAGS = {
+    '--scan-dir': ('scan_dir', 'value'),
+    '--github-repo': ('github_repo', 'value'),
+    '--output-dir': ('output_dir', 'value'),
+    '--data-type': ('data_type', 'value'),
+    '--extract-data-detailed': ('extract_data_detailed', 'flag'),
+    '--project': ('project', 'value'),
+    '--config': ('config', 'value'),
+    '--file-extensions': ('file_extensions', 'list'),
+    '--ignore-patterns': ('ignore_patterns', 'list'),
+    '--context-lines': ('context_lines', 'int'),
+    '--verbose': ('verbose', 'flag'),
+    '-v': ('verbose', 'flag'),
+    '--dry-run': ('dry_run', 'flag'),
+}
+
+_DATA_TYPES = frozenset([
+    'user-data', 'system-data', 'error-data', 'performance-data', 'configuration-data'
+])
+
+
+def _defaults() -> dict:
+    """Return the argparse defaults for every destination."""
+    return {
+        'scan_dir': None,
+        'github_repo': None,
+        'output_dir': './reports',
+        'data_type': None,
+        'extract_data_detailed': False,
+        'project': None,
+        'config': None,
+        'file_extensions': ['.ts', '.tsx', '.js', '.jsx'],
+        'ignore_patterns': None,
+        'context_lines': 3,
+        'verbose': False,
+        'dry_run': False,
+    }
+
+
+def parse(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse argv (including the program name) in a single pass.
+
+    Returns None whenever argparse should handle the arguments instead.
+    """
+    values = _defaults()
+    args = argv[1:]
+    i = 0
+    count = len(args)
+
+    while i < count:
+        spec = _FLAGS.get(args[i])
+        if spec is None:
+            return None
+        dest, kind = spec
+        i += 1
+
+        if kind == 'flag':
+            values[dest] = True
+            continue
+
+        if kind == 'list':
+            start = i
+            while i < count and not args[i].startswith('-'):
+                i += 1
+            if i == start:
+                return None
+            values[dest] = args[start:i]
+            continue
+
+        if i == count or args[i].startswith('-'):
+            return None
+        value = args[i]
+        i += 1
+
+        if kind == 'int':
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+
+        values[dest] = value
+
+    if values['scan_dir'] is None:
+        return None
+    if values['data_type'] is not None and values['data_type'] not in _DATA_TYPES:
+        return None
+
+    return SimpleNamespace(**values)
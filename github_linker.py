@@ -1,49 +1,240 @@
 """GitHub URL generation for file locations."""
 
+import json
+import os
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote
 
 
+# Environment for git subprocesses: C locale output, and no optional index
+# locks so concurrent scans never wait on each other
+_GIT_ENV = {**os.environ, 'LC_ALL': 'C', 'GIT_OPTIONAL_LOCKS': '0'}
+
+# URLs accepted by GitHubLinker.validate_github_url
+_GITHUB_URL_PREFIXES = ('https://github.com/', 'http://github.com/')
+
+
+def _relative_to_root(path: str, root: str) -> Optional[str]:
+    """Return path relative to root ('' for root itself), or None if it lies outside.
+    
+    Plain string slicing when both paths are absolute; relative ones (e.g. a
+    scan root of '.') are made absolute first so they compare like for like.
+    """
+    if not (os.path.isabs(path) and os.path.isabs(root)):
+        path, root = os.path.abspath(path), os.path.abspath(root)
+    if path == root:
+        return ''
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return None
+
+
+class _BranchCacheStore:
+    """JSON file remembering the branch detected for each repository across runs.
+
+    Entries are keyed by .git directory and are only trusted while its HEAD
+    mtime is unchanged and the entry is younger than the TTL.
+    """
+    
+    def __init__(self, path: str, ttl: float):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, dict]] = None
+        # Branches may be detected from several threads at once
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, dict]:
+        """Read the cache file on first use; a missing or corrupt file is empty.
+        
+        Callers must hold self._lock.
+        """
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+    
+    def get(self, git_dir: str, head_mtime: float) -> Optional[str]:
+        """Return the cached branch if it is still valid."""
+        with self._lock:
+            entry = self._load().get(git_dir)
+        if (entry and entry.get('mtime') == head_mtime and
+                time.time() - entry.get('timestamp', 0) < self.ttl):
+            return entry.get('branch')
+        return None
+    
+    def put(self, git_dir: str, branch: str, head_mtime: float) -> None:
+        """Record a branch and atomically rewrite the cache file."""
+        with self._lock:
+            entries = self._load()
+            entries[git_dir] = {'branch': branch, 'mtime': head_mtime, 'timestamp': time.time()}
+            
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                # The cache is only an optimisation; never fail a scan over it
+                pass
+
+
 class GitHubLinker:
     """Handles GitHub URL generation for file locations."""
     
     def __init__(self, base_url: str = "https://github.com/Volley-Inc", 
-                 default_branch: str = "main"):
+                 default_branch: str = "main",
+                 branch_cache_path: Optional[str] = None,
+                 branch_cache_ttl: float = 1800):
         self.base_url = base_url
         self.default_branch = default_branch
         self._branch_cache = {}
+        # Branch per git directory, so projects sharing a repository share one lookup
+        self._gitdir_branch_cache: Dict[str, str] = {}
+        # "{base_url}/{project}/blob/{branch}/" per (project, branch)
+        self._url_prefix_cache: Dict[Tuple[str, str], str] = {}
+        self._branch_store = (
+            _BranchCacheStore(branch_cache_path, branch_cache_ttl) if branch_cache_path else None
+        )
     
     def get_project_name_from_path(self, file_path: str, scan_root: str) -> str:
         """Extract project name from file path."""
-        file_path_obj = Path(file_path)
-        scan_root_obj = Path(scan_root)
-        
-        try:
-            relative_path = file_path_obj.relative_to(scan_root_obj)
-            return relative_path.parts[0]
-        except ValueError:
-            # If file_path is not relative to scan_root, try to extract from path
-            return file_path_obj.parts[-3] if len(file_path_obj.parts) >= 3 else "unknown"
+        parent_dir, file_name = os.path.split(file_path)
+        # A file directly under the scan root names its own "project"
+        return self._project_from_dir(parent_dir, scan_root) or file_name
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _project_from_dir(parent_dir: str, scan_root: str) -> str:
+        """Project name for files in parent_dir; '' when parent_dir is the scan root."""
+        relative_path = _relative_to_root(parent_dir, scan_root)
+        if relative_path is None:
+            # If the file is not under scan_root, take its grandparent directory's name
+            return os.path.basename(os.path.dirname(parent_dir)) or "unknown"
+        return relative_path.split(os.sep, 1)[0]
     
     def get_branch_for_project(self, project_path: str) -> str:
         """Get the current branch for a project."""
         if project_path in self._branch_cache:
             return self._branch_cache[project_path]
         
+        git_dir = self._find_git_dir(project_path)
+        if git_dir is not None and git_dir in self._gitdir_branch_cache:
+            branch = self._gitdir_branch_cache[git_dir]
+            self._branch_cache[project_path] = branch
+            return branch
+        
+        branch = self._read_head_branch(git_dir) if git_dir else None
+        if branch:
+            self._gitdir_branch_cache[git_dir] = branch
+            self._branch_cache[project_path] = branch
+            return branch
+        
+        head_mtime = self._get_head_mtime(git_dir) if self._branch_store and git_dir else None
+        if head_mtime is not None:
+            branch = self._branch_store.get(git_dir, head_mtime)
+            if branch:
+                self._gitdir_branch_cache[git_dir] = branch
+                self._branch_cache[project_path] = branch
+                return branch
+        
+        branch = self._detect_branch(project_path)
+        if branch is None:
+            # Fallback to default branch; not shared or persisted so git is asked again
+            branch = self.default_branch
+        elif git_dir is not None:
+            self._gitdir_branch_cache[git_dir] = branch
+            if head_mtime is not None:
+                self._branch_store.put(git_dir, branch, head_mtime)
+        
+        self._branch_cache[project_path] = branch
+        return branch
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _find_git_dir(project_path: str) -> Optional[str]:
+        """Return the nearest .git at or above project_path, or None outside a repository."""
+        directory = os.path.abspath(project_path)
+        while True:
+            candidate = os.path.join(directory, '.git')
+            if os.path.exists(candidate):
+                return candidate
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+    
+    @staticmethod
+    def _read_head_branch(git_dir: str) -> Optional[str]:
+        """Return the branch git_dir/HEAD points at, or None if detached or unreadable.
+        
+        This is what `git branch --show-current` reports, without starting git.
+        """
+        try:
+            with open(os.path.join(git_dir, 'HEAD'), 'rb') as f:
+                head = f.read().strip()
+        except OSError:
+            return None
+        if head.startswith(b'ref: refs/heads/'):
+            return head[len(b'ref: refs/heads/'):].decode('utf-8', errors='replace') or None
+        return None
+    
+    @staticmethod
+    def _get_head_mtime(git_dir: str) -> Optional[float]:
+        """Return the mtime of git_dir/HEAD, or None if it has none (e.g. a worktree .git file)."""
+        try:
+            return os.stat(os.path.join(git_dir, 'HEAD')).st_mtime
+        except OSError:
+            return None
+    
+    def prefetch_branches(self, project_paths: List[str], max_workers: int = 8) -> None:
+        """Detect the branches of many projects concurrently to warm the caches.
+        
+        git runs once per repository; projects sharing one are filled in
+        from its result afterwards.
+        """
+        by_git_dir = {}
+        for path in project_paths:
+            if path not in self._branch_cache:
+                by_git_dir.setdefault(self._find_git_dir(path) or path, []).append(path)
+        
+        if not by_git_dir:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(by_git_dir))) as executor:
+            futures = [executor.submit(self.get_branch_for_project, paths[0])
+                       for paths in by_git_dir.values()]
+            for future in as_completed(futures):
+                future.result()
+        
+        # The rest are now cache hits on their shared git directory
+        for paths in by_git_dir.values():
+            for path in paths[1:]:
+                self.get_branch_for_project(path)
+    
+    def _detect_branch(self, project_path: str) -> Optional[str]:
+        """Ask git for the project's branch; None if git cannot tell."""
         try:
             result = subprocess.run(
                 ['git', 'branch', '--show-current'],
                 cwd=project_path,
                 capture_output=True,
-                text=True,
+                env=_GIT_ENV,
                 timeout=5
             )
             
-            if result.returncode == 0 and result.stdout.strip():
-                branch = result.stdout.strip()
-                self._branch_cache[project_path] = branch
+            branch = result.stdout.decode('utf-8', 'replace').strip()
+            if result.returncode == 0 and branch:
                 return branch
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
             pass
@@ -54,20 +245,17 @@ class GitHubLinker:
                 ['git', 'symbolic-ref', 'refs/remotes/origin/HEAD'],
                 cwd=project_path,
                 capture_output=True,
-                text=True,
+                env=_GIT_ENV,
                 timeout=5
             )
             
-            if result.returncode == 0 and result.stdout.strip():
-                branch = result.stdout.strip().split('/')[-1]
-                self._branch_cache[project_path] = branch
-                return branch
+            ref = result.stdout.decode('utf-8', 'replace').strip()
+            if result.returncode == 0 and ref:
+                return ref.split('/')[-1]
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
             pass
         
-        # Fallback to default branch
-        self._branch_cache[project_path] = self.default_branch
-        return self.default_branch
+        return None
     
     def generate_file_url(self, file_path: str, line_number: int, 
                          scan_root: str, project_path: Optional[str] = None) -> str:
@@ -75,16 +263,13 @@ class GitHubLinker:
         project_name = self.get_project_name_from_path(file_path, scan_root)
         
         # Get relative path within the project
-        file_path_obj = Path(file_path)
-        scan_root_obj = Path(scan_root)
-        
-        try:
-            relative_path = file_path_obj.relative_to(scan_root_obj)
+        relative_path = _relative_to_root(file_path, scan_root)
+        if relative_path is None:
+            # Fallback: use the file name as-is
+            project_relative_path = os.path.basename(file_path)
+        else:
             # Remove the project name from the path
-            project_relative_path = Path(*relative_path.parts[1:])
-        except ValueError:
-            # Fallback: use the file path as-is
-            project_relative_path = file_path_obj.name
+            project_relative_path = relative_path.partition(os.sep)[2] or os.curdir
         
         # Determine branch
         if project_path:
@@ -92,9 +277,12 @@ class GitHubLinker:
         else:
             branch = self.default_branch
         
-        # Construct GitHub URL
-        repo_url = f"{self.base_url}/{project_name}"
-        file_url = f"{repo_url}/blob/{branch}/{project_relative_path}"
+        # Construct GitHub URL; the prefix is shared by every file in the project
+        key = (project_name, branch)
+        prefix = self._url_prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._url_prefix_cache[key] = f"{self.base_url}/{project_name}/blob/{branch}/"
+        file_url = prefix + project_relative_path
         
         # Add line number anchor
         if line_number > 0:
@@ -108,14 +296,7 @@ class GitHubLinker:
     
     def validate_github_url(self, url: str) -> bool:
         """Validate if a GitHub URL is properly formatted."""
-        try:
-            import urllib.request
-            # Just check if URL is well-formed, don't actually fetch
-            parsed = urllib.parse.urlparse(url)
-            return (parsed.scheme in ['http', 'https'] and 
-                   'github.com' in parsed.netloc)
-        except:
-            return False
+        return isinstance(url, str) and url.startswith(_GITHUB_URL_PREFIXES)
     
     def get_repository_info(self, project_path: str) -> dict:
         """Get repository information from git."""
@@ -131,24 +312,24 @@ class GitHubLinker:
                 ['git', 'remote', 'get-url', 'origin'],
                 cwd=project_path,
                 capture_output=True,
-                text=True,
+                env=_GIT_ENV,
                 timeout=5
             )
             
             if result.returncode == 0:
-                info['remote_url'] = result.stdout.strip()
+                info['remote_url'] = result.stdout.decode('utf-8', 'replace').strip()
             
-            # Get current commit hash
+            # Get current commit hash; --verify keeps an empty repository from printing 'HEAD'
             result = subprocess.run(
-                ['git', 'rev-parse', 'HEAD'],
+                ['git', 'rev-parse', '--verify', '--quiet', 'HEAD'],
                 cwd=project_path,
                 capture_output=True,
-                text=True,
+                env=_GIT_ENV,
                 timeout=5
             )
             
             if result.returncode == 0:
-                info['commit_hash'] = result.stdout.strip()[:7]  # Short hash
+                info['commit_hash'] = result.stdout.decode('ascii', 'replace').strip()[:7]  # Short hash
                 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
             pass
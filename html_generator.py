@@ -1,21 +1,121 @@
 """HTML report generation for DataDog analysis results."""
 
-import json
 import os
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Set
 from datetime import datetime
+from types import SimpleNamespace
+import orjson
 from jinja2 import Template, Environment, FileSystemLoader
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name
-from pygments.formatters import HtmlFormatter
+from markupsafe import Markup, escape
 
-from models import ScanResults, DataDogFinding, DataCategory, DataDogOperationType
+from models import (
+    ScanResults, DataDogFinding, DataCategory, DataDogOperationType,
+    OPERATION_VALUES, CATEGORY_VALUES, json_default
+)
+
+
+# Column-wise view of the findings, built once per report
+FindingsColumns = namedtuple('FindingsColumns', [
+    'project_name', 'file_path', 'line_number', 'code_snippet', 'context_lines',
+    'operation_value', 'category_value', 'data_json', 'data_json_pretty', 'github_url'
+])
+
+# Static page used when a scan produced no findings
+EMPTY_REPORT_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            color: #333;
+            background-color: #f5f5f5;
+            text-align: center;
+            padding: 2rem;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 2rem;
+            border-radius: 10px;
+            margin-bottom: 2rem;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{title}</h1>
+        <p>Generated on {generated_at}</p>
+    </div>
+    <p>No DataDog usage found in {projects} projects ({files} files scanned in {duration:.2f}s).</p>
+</body>
+</html>'''
+
+CSV_HEADER = ('Project,File Path,Line Number,Operation Type,'
+              'Data Category,Code Snippet,Data Being Sent,GitHub URL')
+
+
+# Markup for a single finding, filled in with pre-escaped values
+FINDING_HTML = '''
+                    <div class="finding-item" 
+                         data-index="{index}"
+                         data-project="{project}"
+                         data-category="{category}"
+                         data-operation="{operation}">
+                        
+                        <div class="finding-header">
+                            <div class="finding-title">{basename}</div>
+                            <div class="finding-meta">
+                                <span class="operation-badge {operation}">
+                                    {operation}
+                                </span>
+                                Line {line_number}
+                            </div>
+                        </div>
+                        
+                        <div class="code-snippet">
+                            <div class="context-lines">{context_lines}
+                            </div>
+                            <div class="main-line">{code}</div>
+                        </div>
+                        {data_block}
+                        <a href="{github_url}" target="_blank" class="github-link">
+                            View on GitHub
+                        </a>
+                        <button class="copy-btn" onclick="copyToClipboard('{code}')">
+                            Copy Code
+                        </button>
+                    </div>'''
+
+CONTEXT_LINE_HTML = '''
+                                <div>{}</div>'''
+
+DATA_BLOCK_HTML = '''
+                        <div class="data-extracted">
+                            <h4>Data Being Sent:</h4>
+                            <pre>{}</pre>
+                        </div>
+                        '''
+
+
+def _csv_esc(value: str) -> str:
+    """Quote a CSV field the way csv.writer's QUOTE_MINIMAL would."""
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
 
 
 class HtmlGenerator:
     """Generates HTML reports from DataDog scan results."""
     
+    # Compiled main template, shared by all generator instances
+    _compiled_template = None
+    
     def __init__(self, output_dir: str = "./reports"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -24,65 +124,116 @@ class HtmlGenerator:
         template_dir = Path(__file__).parent / "templates"
         self.env = Environment(loader=FileSystemLoader(str(template_dir)))
         
-        # Setup Pygments
-        self.formatter = HtmlFormatter(style='github-dark', linenos=False)
+        # Pygments formatter is created on first use by _highlight_code
+        self.formatter = None
     
     def generate_report(self, scan_results: ScanResults, 
                        title: str = "DataDog Usage Analysis") -> str:
         """Generate complete HTML report from scan results."""
         
-        # Prepare data for template
-        template_data = self._prepare_template_data(scan_results, title)
+        report_path = self.output_dir / "datadog_analysis_report.html"
         
-        # Generate main report
-        report_html = self._generate_main_report(template_data)
+        # Nothing to render, so skip template preparation entirely
+        if not scan_results.findings:
+            self._write_empty_report(scan_results, title, report_path)
+            return str(report_path)
         
-        # Write report to file
-        report_path = self.output_dir / "datadog_analysis_report.html"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(report_html)
+        # Lay out the findings column-wise once and share them across all outputs
+        cols = self._build_columns(scan_results.findings)
         
-        # Generate additional files
-        self._generate_json_export(scan_results)
-        self._generate_csv_export(scan_results)
+        # Prepare data for template
+        template_data = self._prepare_template_data(scan_results, title, cols)
+        
+        # The three outputs only read shared data, so produce them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self._write_html, template_data, report_path),
+                executor.submit(self._generate_json_export, scan_results),
+                executor.submit(self._generate_csv_export, cols)
+            ]
+            for future in futures:
+                future.result()
         
         return str(report_path)
     
-    def _prepare_template_data(self, scan_results: ScanResults, title: str) -> Dict[str, Any]:
-        """Prepare data for HTML template."""
-        
-        # Calculate statistics
-        stats = self._calculate_statistics(scan_results)
+    def _write_empty_report(self, scan_results: ScanResults, title: str, report_path: Path) -> None:
+        """Write a static report and header-only exports for a scan without findings."""
+        report_path.write_bytes(EMPTY_REPORT_HTML.format(
+            title=escape(title),
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            projects=len(scan_results.projects),
+            files=scan_results.total_files_scanned,
+            duration=scan_results.scan_duration
+        ).encode('utf-8'))
         
-        # Group findings
-        findings_by_project = self._group_findings_by_project(scan_results.findings)
-        findings_by_category = self._group_findings_by_category(scan_results.findings)
-        findings_by_operation = self._group_findings_by_operation(scan_results.findings)
+        self._generate_json_export(scan_results)
+        self._generate_csv_export(self._build_columns([]))
+    
+    def _build_columns(self, findings: List[DataDogFinding]) -> FindingsColumns:
+        """Transpose findings into parallel per-field lists.
+        
+        Each payload is encoded twice here: compact in insertion order for the
+        CSV, and indented with sorted keys for the HTML data block.
+        """
+        return FindingsColumns(
+            project_name=[f.project_name for f in findings],
+            file_path=[f.file_path for f in findings],
+            line_number=[f.line_number for f in findings],
+            code_snippet=[f.code_snippet for f in findings],
+            context_lines=[f.context_lines for f in findings],
+            operation_value=[OPERATION_VALUES[f.operation_type] for f in findings],
+            category_value=[CATEGORY_VALUES[f.data_category] for f in findings],
+            data_json=[orjson.dumps(f.data_being_sent, default=json_default).decode() for f in findings],
+            data_json_pretty=[
+                orjson.dumps(f.data_being_sent, default=json_default,
+                             option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+                if f.data_being_sent else ''
+                for f in findings
+            ],
+            github_url=[f.github_url for f in findings]
+        )
+    
+    def _prepare_template_data(self, scan_results: ScanResults, title: str,
+                               cols: FindingsColumns) -> Dict[str, Any]:
+        """Prepare data for HTML template."""
         
         # Process findings with syntax highlighting
-        processed_findings = self._process_findings_for_display(scan_results.findings)
+        processed_findings = self._process_findings_for_display(cols)
         
         return {
             'title': title,
             'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'scan_results': scan_results,
-            'statistics': stats,
-            'findings_by_project': findings_by_project,
-            'findings_by_category': findings_by_category,
-            'findings_by_operation': findings_by_operation,
+            'statistics': self._compute_statistics(cols),
             'processed_findings': processed_findings,
+            'project_findings': self._group_findings_by_project(processed_findings),
+            'render_finding': self._render_finding_html,
+            'findings_index': self._build_findings_index(
+                cols, {project.name for project in scan_results.projects}
+            ),
             'projects': scan_results.projects,
             'total_findings': len(scan_results.findings)
         }
     
+    def _write_html(self, template_data: Dict[str, Any], report_path: Path) -> None:
+        """Render the main report, streaming it to disk as UTF-8 bytes."""
+        template = self._get_compiled_template()
+        
+        with open(report_path, 'wb') as f:
+            for chunk in template.generate(**template_data):
+                f.write(chunk.encode('utf-8'))
+    
     def _generate_main_report(self, template_data: Dict[str, Any]) -> str:
         """Generate the main HTML report."""
         
-        # Create embedded template if template file doesn't exist
-        template_content = self._get_main_template()
-        template = Template(template_content)
-        
-        return template.render(**template_data)
+        return self._get_compiled_template().render(**template_data)
+    
+    def _get_compiled_template(self) -> Template:
+        """Compile the embedded template once and reuse it for every report."""
+        cls = type(self)
+        if cls._compiled_template is None:
+            cls._compiled_template = Template(self._get_main_template(), autoescape=True)
+        return cls._compiled_template
     
     def _get_main_template(self) -> str:
         """Get the main HTML template content."""
@@ -443,48 +594,7 @@ class HtmlGenerator:
                     </div>
                 </div>
                 <div class="project-content" id="project-{{ project.name }}">
-                    {% for finding in processed_findings %}
-                    {% if finding.project_name == project.name %}
-                    <div class="finding-item" 
-                         data-project="{{ finding.project_name }}"
-                         data-category="{{ finding.data_category.value }}"
-                         data-operation="{{ finding.operation_type.value }}">
-                        
-                        <div class="finding-header">
-                            <div class="finding-title">{{ finding.file_path.split('/')[-1] }}</div>
-                            <div class="finding-meta">
-                                <span class="operation-badge {{ finding.operation_type.value }}">
-                                    {{ finding.operation_type.value }}
-                                </span>
-                                Line {{ finding.line_number }}
-                            </div>
-                        </div>
-                        
-                        <div class="code-snippet">
-                            <div class="context-lines">
-                                {% for line in finding.context_lines[:-1] %}
-                                <div>{{ line }}</div>
-                                {% endfor %}
-                            </div>
-                            <div class="main-line">{{ finding.code_snippet }}</div>
-                        </div>
-                        
-                        {% if finding.data_being_sent %}
-                        <div class="data-extracted">
-                            <h4>Data Being Sent:</h4>
-                            <pre>{{ finding.data_being_sent|tojson(indent=2) }}</pre>
-                        </div>
-                        {% endif %}
-                        
-                        <a href="{{ finding.github_url }}" target="_blank" class="github-link">
-                            View on GitHub
-                        </a>
-                        <button class="copy-btn" onclick="copyToClipboard('{{ finding.code_snippet|e }}')">
-                            Copy Code
-                        </button>
-                    </div>
-                    {% endif %}
-                    {% endfor %}
+                    {% for index, finding in project_findings.get(project.name, []) %}{{ render_finding(index, finding) }}{% endfor %}
                 </div>
             </div>
             {% endfor %}
@@ -496,6 +606,7 @@ class HtmlGenerator:
         </div>
     </div>
     
+    <script id="findings-index" type="application/json">{{ findings_index }}</script>
     <script>
         // Project toggle functionality
         function toggleProject(projectName) {
@@ -517,31 +628,51 @@ class HtmlGenerator:
             const categoryFilter = document.getElementById('categoryFilter');
             const operationFilter = document.getElementById('operationFilter');
             
+            // Findings grouped as project -> category -> operation -> [index]
+            const findingsIndex = JSON.parse(document.getElementById('findings-index').textContent);
+            const items = [];
+            const texts = [];
+            document.querySelectorAll('.finding-item').forEach(item => {
+                const index = Number(item.getAttribute('data-index'));
+                items[index] = item;
+                texts[index] = item.textContent.toLowerCase();
+            });
+            // forEach skips the holes left by findings that were not rendered
+            let visible = new Set();
+            items.forEach((item, i) => visible.add(i));
+            
+            function matchingIndices(selectedProject, selectedCategory, selectedOperation) {
+                const matches = [];
+                for (const [project, categories] of Object.entries(findingsIndex)) {
+                    if (selectedProject && project !== selectedProject) continue;
+                    for (const [category, operations] of Object.entries(categories)) {
+                        if (selectedCategory && category !== selectedCategory) continue;
+                        for (const [operation, indices] of Object.entries(operations)) {
+                            if (selectedOperation && operation !== selectedOperation) continue;
+                            matches.push(...indices.filter(i => items[i]));
+                        }
+                    }
+                }
+                return matches;
+            }
+            
             function filterFindings() {
                 const searchTerm = searchInput.value.toLowerCase();
-                const selectedProject = projectFilter.value;
-                const selectedCategory = categoryFilter.value;
-                const selectedOperation = operationFilter.value;
-                
-                const findings = document.querySelectorAll('.finding-item');
+                const candidates = matchingIndices(
+                    projectFilter.value, categoryFilter.value, operationFilter.value
+                );
+                const nextVisible = new Set(
+                    searchTerm ? candidates.filter(i => texts[i].includes(searchTerm)) : candidates
+                );
                 
-                findings.forEach(finding => {
-                    const project = finding.getAttribute('data-project');
-                    const category = finding.getAttribute('data-category');
-                    const operation = finding.getAttribute('data-operation');
-                    const text = finding.textContent.toLowerCase();
-                    
-                    const matchesSearch = !searchTerm || text.includes(searchTerm);
-                    const matchesProject = !selectedProject || project === selectedProject;
-                    const matchesCategory = !selectedCategory || category === selectedCategory;
-                    const matchesOperation = !selectedOperation || operation === selectedOperation;
-                    
-                    if (matchesSearch && matchesProject && matchesCategory && matchesOperation) {
-                        finding.style.display = 'block';
-                    } else {
-                        finding.style.display = 'none';
-                    }
+                // Only touch findings whose visibility actually changes
+                visible.forEach(i => {
+                    if (!nextVisible.has(i)) items[i].classList.add('hidden');
+                });
+                nextVisible.forEach(i => {
+                    if (!visible.has(i)) items[i].classList.remove('hidden');
                 });
+                visible = nextVisible;
             }
             
             searchInput.addEventListener('input', filterFindings);
@@ -553,105 +684,120 @@ class HtmlGenerator:
 </body>
 </html>'''
     
-    def _calculate_statistics(self, scan_results: ScanResults) -> Dict[str, Any]:
-        """Calculate statistics from scan results."""
-        stats = {
-            'total_findings': len(scan_results.findings),
-            'by_project': {},
-            'by_category': {},
-            'by_operation': {},
-            'files_with_datadog': set()
-        }
-        
-        for finding in scan_results.findings:
-            # Count by project
-            project = finding.project_name
-            stats['by_project'][project] = stats['by_project'].get(project, 0) + 1
-            
-            # Count by category
-            category = finding.data_category.value
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Count by operation
-            operation = finding.operation_type.value
-            stats['by_operation'][operation] = stats['by_operation'].get(operation, 0) + 1
-            
-            # Track files with DataDog
-            stats['files_with_datadog'].add(finding.file_path)
+    def _compute_statistics(self, cols: FindingsColumns) -> Dict[str, Any]:
+        """Count findings by project, category and operation in a single pass."""
+        by_project = Counter()
+        by_category = Counter()
+        by_operation = Counter()
+        files_with_datadog = set()
+        
+        for project, category, operation, file_path in zip(
+            cols.project_name, cols.category_value, cols.operation_value, cols.file_path
+        ):
+            by_project[project] += 1
+            by_category[category] += 1
+            by_operation[operation] += 1
+            files_with_datadog.add(file_path)
         
-        stats['files_with_datadog'] = len(stats['files_with_datadog'])
-        
-        return stats
+        return {
+            'total_findings': len(cols.file_path),
+            'by_project': by_project,
+            'by_category': by_category,
+            'by_operation': by_operation,
+            'files_with_datadog': len(files_with_datadog)
+        }
     
-    def _group_findings_by_project(self, findings: List[DataDogFinding]) -> Dict[str, List[DataDogFinding]]:
-        """Group findings by project."""
-        grouped = {}
-        for finding in findings:
-            project = finding.project_name
-            if project not in grouped:
-                grouped[project] = []
-            grouped[project].append(finding)
-        return grouped
+    def _process_findings_for_display(self, cols: FindingsColumns) -> List[SimpleNamespace]:
+        """Process findings for display, precomputing fields the template needs.
+        
+        Code and data fields are escaped here as Markup so the autoescaping
+        template emits them as-is.
+        """
+        return [
+            SimpleNamespace(
+                project_name=project_name,
+                file_path=file_path,
+                basename=os.path.basename(file_path),
+                line_number=line_number,
+                operation=operation,
+                category=category,
+                code_snippet=code_snippet,
+                code_escaped=escape(code_snippet),
+                context_lines=context_lines,
+                context_lines_html=[escape(line) for line in context_lines[:-1]],
+                data_json=escape(data_json_pretty),
+                github_url=github_url
+            )
+            for (project_name, file_path, line_number, code_snippet, context_lines,
+                 operation, category, _, data_json_pretty, github_url) in zip(*cols)
+        ]
     
-    def _group_findings_by_category(self, findings: List[DataDogFinding]) -> Dict[str, List[DataDogFinding]]:
-        """Group findings by data category."""
-        grouped = {}
-        for finding in findings:
-            category = finding.data_category.value
-            if category not in grouped:
-                grouped[category] = []
-            grouped[category].append(finding)
-        return grouped
+    def _group_findings_by_project(self, processed_findings: List[SimpleNamespace]) -> Dict[str, list]:
+        """Group display findings by project, keeping each finding's report index."""
+        by_project = defaultdict(list)
+        
+        for index, finding in enumerate(processed_findings):
+            by_project[finding.project_name].append((index, finding))
+        
+        return dict(by_project)
     
-    def _group_findings_by_operation(self, findings: List[DataDogFinding]) -> Dict[str, List[DataDogFinding]]:
-        """Group findings by operation type."""
-        grouped = {}
-        for finding in findings:
-            operation = finding.operation_type.value
-            if operation not in grouped:
-                grouped[operation] = []
-            grouped[operation].append(finding)
-        return grouped
+    def _render_finding_html(self, index: int, finding: SimpleNamespace) -> Markup:
+        """Render one finding block with plain string formatting."""
+        return Markup(FINDING_HTML.format(
+            index=index,
+            project=escape(finding.project_name),
+            category=escape(finding.category),
+            operation=escape(finding.operation),
+            basename=escape(finding.basename),
+            line_number=finding.line_number,
+            context_lines=''.join(map(CONTEXT_LINE_HTML.format, finding.context_lines_html)),
+            code=finding.code_escaped,
+            data_block=DATA_BLOCK_HTML.format(finding.data_json) if finding.data_json else '',
+            github_url=escape(finding.github_url)
+        ))
     
-    def _process_findings_for_display(self, findings: List[DataDogFinding]) -> List[DataDogFinding]:
-        """Process findings for display with syntax highlighting."""
-        # For now, return as-is. Could add syntax highlighting here
-        return findings
+    def _build_findings_index(self, cols: FindingsColumns, rendered_projects: Set[str]) -> Markup:
+        """Index finding positions by project, category and operation for the JS filter.
+        
+        Only findings of rendered projects are indexed, so every index has an element.
+        """
+        index = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        
+        for position, (project, category, operation) in enumerate(zip(
+            cols.project_name, cols.category_value, cols.operation_value
+        )):
+            if project in rendered_projects:
+                index[project][category][operation].append(position)
+        
+        # Escape '<' so a project name cannot close the surrounding script element
+        return Markup(orjson.dumps(index).decode().replace('<', '\\u003c'))
     
     def _generate_json_export(self, scan_results: ScanResults) -> None:
         """Generate JSON export of scan results."""
         json_path = self.output_dir / "datadog_findings.json"
         
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(scan_results.to_dict(), f, indent=2, ensure_ascii=False)
+        # orjson encodes the dataclasses and enums directly, without an intermediate dict tree
+        json_path.write_bytes(orjson.dumps(scan_results, default=json_default, option=orjson.OPT_INDENT_2))
     
-    def _generate_csv_export(self, scan_results: ScanResults) -> None:
+    def _generate_csv_export(self, cols: FindingsColumns) -> None:
         """Generate CSV export of scan results."""
         csv_path = self.output_dir / "datadog_findings.csv"
         
-        import csv
-        
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Write header
-            writer.writerow([
-                'Project', 'File Path', 'Line Number', 'Operation Type',
-                'Data Category', 'Code Snippet', 'Data Being Sent', 'GitHub URL'
-            ])
-            
-            # Write findings
-            for finding in scan_results.findings:
-                writer.writerow([
-                    finding.project_name,
-                    finding.file_path,
-                    finding.line_number,
-                    finding.operation_type.value,
-                    finding.data_category.value,
-                    finding.code_snippet,
-                    json.dumps(finding.data_being_sent),
-                    finding.github_url
-                ])
+        # Format every row up front and emit the file in a single write
+        lines = [CSV_HEADER]
+        lines.extend(
+            f'{_csv_esc(project)},{_csv_esc(file_path)},{line_number},'
+            f'{_csv_esc(operation)},{_csv_esc(category)},{_csv_esc(code)},'
+            f'{_csv_esc(data)},{_csv_esc(url)}'
+            for project, file_path, line_number, operation, category, code, data, url in zip(
+                cols.project_name, cols.file_path, cols.line_number,
+                cols.operation_value, cols.category_value, cols.code_snippet,
+                cols.data_json, cols.github_url
+            )
+        )
+        lines.append('')
+        
+        csv_path.write_bytes('\r\n'.join(lines).encode('utf-8'))
     
     def _get_file_extension(self, file_path: str) -> str:
         """Get file extension to determine lexer."""
@@ -660,6 +806,14 @@ class HtmlGenerator:
     def _highlight_code(self, code: str, file_path: str) -> str:
         """Apply syntax highlighting to code."""
         try:
+            # Pygments is only imported when highlighting is actually used
+            from pygments import highlight
+            from pygments.lexers import get_lexer_by_name
+            from pygments.formatters import HtmlFormatter
+            
+            if self.formatter is None:
+                self.formatter = HtmlFormatter(style='github-dark', linenos=False)
+            
             ext = self._get_file_extension(file_path)
             
             if ext in ['.ts', '.tsx']:
@@ -2,29 +2,72 @@
 """Main entry point for DataDog analyser."""
 
 import argparse
+import os
+import stat
 import sys
 import logging
-from pathlib import Path
+import queue
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
 from typing import List, Optional
 
+import fast_cli
 from config import AppConfig, ConfigManager
-from code_scanner import CodeScanner
-from github_linker import GitHubLinker
-from html_generator import HtmlGenerator
-from models import DataCategory, DataDogOperationType
+from models import DataCategory, DataDogOperationType, CATEGORY_VALUES
+
+
+# CLI data type names mapped to their categories
+_DATA_TYPE_MAP = {
+    'user-data': DataCategory.USER_DATA,
+    'system-data': DataCategory.SYSTEM_DATA,
+    'error-data': DataCategory.ERROR_DATA,
+    'performance-data': DataCategory.PERFORMANCE_DATA,
+    'configuration-data': DataCategory.CONFIGURATION_DATA
+}
+
+_project_name_of = attrgetter('project_name')
+
+# Background thread draining the logging queue, started by setup_logging
+_log_listener = None
 
 
 def setup_logging(verbose: bool = False) -> None:
-    """Setup logging configuration."""
+    """Setup logging configuration.
+    
+    Records are queued by the calling thread and written to stdout and the
+    log file by a background listener, so scanning never waits on log I/O.
+    """
+    global _log_listener
+    
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('datadog_analyser.log')
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler('datadog_analyser.log')
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Leave the final formatting to the listener's handlers
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    
+    _log_listener = QueueListener(log_queue, *handlers)
+    _log_listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _log_listener
+    
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -119,18 +162,18 @@ Examples:
 
 def validate_arguments(args: argparse.Namespace) -> None:
     """Validate command line arguments."""
-    # Check if scan directory exists
-    scan_dir = Path(args.scan_dir)
-    if not scan_dir.exists():
-        raise ValueError(f"Scan directory does not exist: {args.scan_dir}")
+    # Check the scan directory with a single stat call
+    try:
+        scan_dir_stat = os.stat(args.scan_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        raise ValueError(f"Scan directory does not exist: {args.scan_dir}") from None
     
-    if not scan_dir.is_dir():
+    if not stat.S_ISDIR(scan_dir_stat.st_mode):
         raise ValueError(f"Scan path is not a directory: {args.scan_dir}")
     
     # Validate output directory
-    output_dir = Path(args.output_dir)
     try:
-        output_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(args.output_dir, exist_ok=True)
     except Exception as e:
         raise ValueError(f"Cannot create output directory {args.output_dir}: {e}")
 
@@ -158,102 +201,82 @@ def create_config_from_args(args: argparse.Namespace) -> AppConfig:
     return config
 
 
-def filter_results_by_data_type(scan_results, data_type: str):
-    """Filter scan results by data type."""
-    if not data_type:
-        return scan_results
+def _apply_filters(scan_results, args: argparse.Namespace):
+    """Filter scan results by data type and project."""
+    target_category = _DATA_TYPE_MAP.get(args.data_type) if args.data_type else None
+    # Interned like the models' project names, so == mostly short-circuits on identity
+    project_name = sys.intern(args.project) if args.project else None
     
-    # Map CLI data type to enum
-    data_type_mapping = {
-        'user-data': DataCategory.USER_DATA,
-        'system-data': DataCategory.SYSTEM_DATA,
-        'error-data': DataCategory.ERROR_DATA,
-        'performance-data': DataCategory.PERFORMANCE_DATA,
-        'configuration-data': DataCategory.CONFIGURATION_DATA
-    }
-    
-    target_category = data_type_mapping.get(data_type)
-    if not target_category:
+    if target_category is None and project_name is None:
         return scan_results
     
-    # Filter findings
-    filtered_findings = [
-        finding for finding in scan_results.findings
-        if finding.data_category == target_category
-    ]
-    
-    # Update project finding counts
-    for project in scan_results.projects:
-        project.findings_count = len([
-            f for f in filtered_findings if f.project_name == project.name
-        ])
-    
-    scan_results.findings = filtered_findings
-    return scan_results
-
-
-def filter_results_by_project(scan_results, project_name: str):
-    """Filter scan results by project."""
-    if not project_name:
-        return scan_results
+    # Start from the grouped findings for one predicate, then apply the other
+    if target_category is not None:
+        candidates = scan_results.get_findings_by_category(target_category)
+    else:
+        candidates = scan_results.get_findings_by_project(project_name)
     
-    # Filter findings
     filtered_findings = [
-        finding for finding in scan_results.findings
-        if finding.project_name == project_name
+        finding for finding in candidates
+        if project_name is None or finding.project_name == project_name
     ]
     
     # Filter projects
-    filtered_projects = [
-        project for project in scan_results.projects
-        if project.name == project_name
-    ]
+    if project_name is not None:
+        target = scan_results.projects_by_name.get(project_name)
+        scan_results.projects = [target] if target is not None else []
     
     # Update finding counts
-    for project in filtered_projects:
-        project.findings_count = len([
-            f for f in filtered_findings if f.project_name == project.name
-        ])
+    counts = Counter(map(_project_name_of, filtered_findings))
+    for project in scan_results.projects:
+        project.findings_count = counts.get(project.name, 0)
     
     scan_results.findings = filtered_findings
-    scan_results.projects = filtered_projects
     return scan_results
 
 
 def print_scan_summary(scan_results):
     """Print a summary of scan results."""
-    print("\n" + "="*60)
-    print("SCAN SUMMARY")
-    print("="*60)
-    print(f"Total projects scanned: {len(scan_results.projects)}")
-    print(f"Total files scanned: {scan_results.total_files_scanned}")
-    print(f"Total DataDog usages found: {len(scan_results.findings)}")
-    print(f"Scan duration: {scan_results.scan_duration:.2f} seconds")
+    lines = [
+        "\n" + "="*60,
+        "SCAN SUMMARY",
+        "="*60,
+        f"Total projects scanned: {len(scan_results.projects)}",
+        f"Total files scanned: {scan_results.total_files_scanned}",
+        f"Total DataDog usages found: {len(scan_results.findings)}",
+        f"Scan duration: {scan_results.scan_duration:.2f} seconds",
+    ]
     
     if scan_results.projects:
-        print(f"\nProjects:")
-        for project in scan_results.projects:
-            print(f"  - {project.name} ({project.project_type}): {project.findings_count} findings")
+        lines.append(f"\nProjects:")
+        lines.extend(
+            f"  - {project.name} ({project.project_type}): {project.findings_count} findings"
+            for project in scan_results.projects
+        )
     
     if scan_results.findings:
-        print(f"\nData categories found:")
-        categories = {}
-        for finding in scan_results.findings:
-            category = finding.data_category.value
-            categories[category] = categories.get(category, 0) + 1
+        lines.append(f"\nData categories found:")
+        # Counts come from the grouped findings index, keyed by enum member
+        categories = scan_results.count_by_category()
         
-        for category, count in sorted(categories.items()):
-            print(f"  - {category}: {count}")
+        lines.extend(
+            f"  - {category}: {count}"
+            for category, count in sorted((CATEGORY_VALUES[c], n) for c, n in categories.items())
+        )
+    
+    lines.append("="*60)
     
-    print("="*60)
+    # Emit the whole summary in one write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> int:
     """Main entry point."""
     try:
-        # Parse arguments
-        parser = create_argument_parser()
-        args = parser.parse_args()
+        # Parse arguments, leaving help and errors to argparse
+        args = fast_cli.parse(sys.argv)
+        if args is None:
+            args = create_argument_parser().parse_args()
         
         # Setup logging
         setup_logging(args.verbose)
@@ -275,10 +298,17 @@ def main() -> int:
             print(f"GitHub base URL: {config.github.base_url}")
             return 0
         
+        # Deferred so --help, --dry-run and argument errors skip loading them
+        from code_scanner import CodeScanner
+        from github_linker import GitHubLinker
+        from html_generator import HtmlGenerator
+        
         # Initialize components
         github_linker = GitHubLinker(
             base_url=config.github.base_url,
-            default_branch=config.github.default_branch
+            default_branch=config.github.default_branch,
+            branch_cache_path=config.github.branch_cache_path,
+            branch_cache_ttl=config.github.branch_cache_ttl
         )
         
         scanner = CodeScanner(config, github_linker)
@@ -288,12 +318,10 @@ def main() -> int:
         scan_results = scanner.scan_directories(config.scan.target_directories)
         
         # Apply filters
+        scan_results = _apply_filters(scan_results, args)
         if args.data_type:
-            scan_results = filter_results_by_data_type(scan_results, args.data_type)
             logger.info(f"Filtered by data type: {args.data_type}")
-        
         if args.project:
-            scan_results = filter_results_by_project(scan_results, args.project)
             logger.info(f"Filtered by project: {args.project}")
         
         # Print summary
@@ -305,8 +333,9 @@ def main() -> int:
         report_path = html_generator.generate_report(scan_results)
         
         print(f"\nHTML report generated: {report_path}")
-        print(f"JSON export: {Path(config.output.output_dir) / 'datadog_findings.json'}")
-        print(f"CSV export: {Path(config.output.output_dir) / 'datadog_findings.csv'}")
+        output_dir = config.output.output_dir
+        print(f"JSON export: {os.path.join(output_dir, 'datadog_findings.json')}")
+        print(f"CSV export: {os.path.join(output_dir, 'datadog_findings.csv')}")
         
         logger.info("Analysis complete")
         return 0
@@ -318,6 +347,8 @@ def main() -> int:
         print(f"Error: {e}")
         logging.getLogger(__name__).exception("Unexpected error")
         return 1
+    finally:
+        shutdown_logging()
 
 
 if __name__ == '__main__':
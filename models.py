@@ -1,8 +1,14 @@
 """Data models for DataDog findings."""
 
+import sys
+from collections import Counter
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
+from pathlib import PurePath
+
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 class DataDogOperationType(Enum):
@@ -31,7 +37,27 @@ class DataCategory(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Enum member to value lookups, resolved once instead of per serialised finding
+OPERATION_VALUES = {op: op.value for op in DataDogOperationType}
+CATEGORY_VALUES = {cat: cat.value for cat in DataCategory}
+
+
+def json_default(obj: Any) -> Any:
+    """Encode values orjson cannot serialise natively, for orjson's default hook.
+    
+    Models, enums and containers are handled by orjson itself; this covers
+    the odd set, path or to_dict()-capable object inside extracted data.
+    """
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serialisable")
+
+
+@dataclass(**_SLOTS)
 class DataDogFinding:
     """Represents a DataDog usage finding in code."""
     file_path: str
@@ -45,15 +71,20 @@ class DataDogFinding:
     project_name: str
     extracted_parameters: Optional[Dict[str, str]] = None
     
+    def __post_init__(self):
+        # Share one string object per project name across all findings
+        if type(self.project_name) is str:
+            self.project_name = sys.intern(self.project_name)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert finding to dictionary for JSON serialisation."""
         return {
             'file_path': self.file_path,
             'line_number': self.line_number,
             'code_snippet': self.code_snippet,
-            'operation_type': self.operation_type.value,
+            'operation_type': OPERATION_VALUES[self.operation_type],
             'data_being_sent': self.data_being_sent,
-            'data_category': self.data_category.value,
+            'data_category': CATEGORY_VALUES[self.data_category],
             'context_lines': self.context_lines,
             'github_url': self.github_url,
             'project_name': self.project_name,
@@ -61,7 +92,7 @@ class DataDogFinding:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProjectInfo:
     """Information about a scanned project."""
     name: str
@@ -70,6 +101,10 @@ class ProjectInfo:
     github_url: str
     findings_count: int = 0
     
+    def __post_init__(self):
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert project info to dictionary."""
         return {
@@ -81,7 +116,7 @@ class ProjectInfo:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScanResults:
     """Results of the DataDog scan."""
     projects: List[ProjectInfo]
@@ -89,15 +124,25 @@ class ScanResults:
     total_files_scanned: int
     scan_duration: float
     
+    @property
+    def projects_by_name(self) -> Dict[str, ProjectInfo]:
+        """Projects keyed by name, built from the current projects list."""
+        return {p.name: p for p in self.projects}
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert scan results to dictionary."""
+        finding_to_dict = DataDogFinding.to_dict
         return {
             'projects': [p.to_dict() for p in self.projects],
-            'findings': [f.to_dict() for f in self.findings],
+            'findings': [finding_to_dict(f) for f in self.findings],
             'total_files_scanned': self.total_files_scanned,
             'scan_duration': self.scan_duration
         }
     
+    def count_by_category(self) -> Dict[DataCategory, int]:
+        """Count findings per data category."""
+        return dict(Counter(f.data_category for f in self.findings))
+    
     def get_findings_by_project(self, project_name: str) -> List[DataDogFinding]:
         """Get all findings for a specific project."""
         return [f for f in self.findings if f.project_name == project_name]
@@ -108,4 +153,4 @@ class ScanResults:
     
     def get_findings_by_operation(self, operation: DataDogOperationType) -> List[DataDogFinding]:
         """Get all findings for a specific operation type."""
-        return [f for f in self.findings if f.operation_type == operation]
\ No newline at end of file
+        return [f for f in self.findings if f.operation_type == operation]
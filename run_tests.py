@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """Test runner script for DataDog analyser."""
 
+import hashlib
 import subprocess
 import sys
 import os
+from importlib import metadata
 from pathlib import Path
 
 
+REQUIREMENTS_FILE = Path("test_requirements.txt")
+# Hash of the last installed test requirements and interpreter, kept in the project
+REQUIREMENTS_MARKER = Path(".test_reqs_hash")
+
+
 def run_command(cmd, description):
     """Run a command and handle errors."""
     print(f"\n{'='*60}")
@@ -14,19 +21,60 @@ def run_command(cmd, description):
     print(f"Command: {' '.join(cmd)}")
     print(f"{'='*60}")
     
+    # Flush our banner first so it appears before the child's output
+    sys.stdout.flush()
+    
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
+        # The child inherits stdout/stderr, so its output streams live
+        subprocess.run(cmd, check=True)
         return True
     except subprocess.CalledProcessError as e:
         print(f"ERROR: {description} failed with exit code {e.returncode}")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
         return False
 
 
+def requirements_installed(requirements_hash):
+    """Check whether the test requirements are already installed."""
+    try:
+        if REQUIREMENTS_MARKER.read_text().strip() == requirements_hash:
+            return True
+    except OSError:
+        pass
+    
+    # No matching marker, so check each listed distribution satisfies its specifier
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return False
+    
+    for line in REQUIREMENTS_FILE.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            # pip options and the like; let pip deal with them
+            return False
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        try:
+            version = metadata.version(requirement.name)
+        except metadata.PackageNotFoundError:
+            return False
+        if not requirement.specifier.contains(version, prereleases=True):
+            return False
+    return True
+
+
+def record_requirements(requirements_hash):
+    """Remember which test requirements are installed."""
+    try:
+        REQUIREMENTS_MARKER.write_text(requirements_hash)
+    except OSError:
+        pass
+
+
 def main():
     """Main test runner."""
     print("DataDog Analyser Test Suite")
@@ -43,21 +91,24 @@ def main():
         print("Run: python -m venv venv && source venv/bin/activate")
         print()
     
-    # Install test dependencies
-    print("Installing test dependencies...")
-    install_cmd = [sys.executable, "-m", "pip", "install", "-r", "test_requirements.txt"]
-    if not run_command(install_cmd, "Installing test dependencies"):
-        return 1
+    # Install test dependencies unless they are already in place
+    # Tied to the interpreter too, so switching environments re-checks the requirements
+    requirements_hash = hashlib.sha256(
+        sys.executable.encode() + b"\0" + REQUIREMENTS_FILE.read_bytes()
+    ).hexdigest()
+    if requirements_installed(requirements_hash):
+        print("Test dependencies already installed, skipping pip install")
+    else:
+        print("Installing test dependencies...")
+        install_cmd = [sys.executable, "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)]
+        if not run_command(install_cmd, "Installing test dependencies"):
+            return 1
+    record_requirements(requirements_hash)
     
-    # Run basic tests
+    # Run the whole suite once, in parallel, with coverage
     test_commands = [
-        ([sys.executable, "-m", "pytest", "-v"], "Running all tests"),
-        ([sys.executable, "-m", "pytest", "--cov=.", "--cov-report=term-missing"], "Running tests with coverage"),
-        ([sys.executable, "-m", "pytest", "test_models.py", "-v"], "Testing models module"),
-        ([sys.executable, "-m", "pytest", "test_config.py", "-v"], "Testing config module"),
-        ([sys.executable, "-m", "pytest", "test_github_linker.py", "-v"], "Testing GitHub linker module"),
-        ([sys.executable, "-m", "pytest", "test_datadog_detector.py", "-v"], "Testing DataDog detector module"),
-        ([sys.executable, "-m", "pytest", "test_code_scanner.py", "-v"], "Testing code scanner module"),
+        ([sys.executable, "-m", "pytest", "-n", "auto", "--cov=.", "--cov-report=term-missing", "-v"],
+         "Running all tests with coverage"),
     ]
     
     failed_tests = []
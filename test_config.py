@@ -1,16 +1,20 @@
 """Unit tests for config.py module."""
 
+import io
+import logging
 import pytest
-import json
-import tempfile
-from pathlib import Path
-from unittest.mock import patch, mock_open
+import orjson
 
 from config import (
     ScanConfig, GitHubConfig, OutputConfig, AppConfig, ConfigManager
 )
 
 
+def _write_pkg(path, deps):
+    """Write a minimal package.json with the given dependencies."""
+    (path / "package.json").write_bytes(orjson.dumps({"name": "test-project", "dependencies": deps}))
+
+
 class TestScanConfig:
     """Test ScanConfig dataclass."""
     
@@ -48,6 +52,7 @@ class TestGitHubConfig:
         assert config.base_url == "https://github.com/Volley-Inc"
         assert config.default_branch == "main"
         assert config.custom_path_mappings == {}
+        assert config.branch_cache_path is None
     
     def test_custom_values(self):
         """Test GitHubConfig with custom values."""
@@ -117,106 +122,62 @@ class TestAppConfig:
 class TestConfigManager:
     """Test ConfigManager class."""
     
-    def test_detect_project_type_react(self):
-        """Test detecting React project type."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create package.json with React dependency
-            package_json = {
-                "name": "test-project",
-                "dependencies": {
-                    "react": "^18.0.0"
-                }
-            }
-            
-            with open(temp_path / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "react"
-    
-    def test_detect_project_type_nextjs(self):
-        """Test detecting Next.js project type."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create package.json with Next.js dependency
-            package_json = {
-                "name": "test-project",
-                "dependencies": {
-                    "next": "^13.0.0",
-                    "react": "^18.0.0"
-                }
-            }
-            
-            with open(temp_path / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "nextjs"
+    @pytest.fixture(autouse=True)
+    def clear_caches(self):
+        """Reset ConfigManager caches so tests do not see each other's lookups."""
+        ConfigManager.get_ignore_patterns_for_project.cache_clear()
+        yield
+        ConfigManager.get_ignore_patterns_for_project.cache_clear()
     
-    def test_detect_project_type_node(self):
-        """Test detecting Node.js project type."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create package.json without React/Next.js
-            package_json = {
-                "name": "test-project",
-                "dependencies": {
-                    "express": "^4.18.0"
-                }
-            }
-            
-            with open(temp_path / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "node"
+    @pytest.mark.parametrize("deps, expected", [
+        ({"react": "^18.0.0"}, "react"),
+        ({"next": "^13.0.0", "react": "^18.0.0"}, "nextjs"),
+        ({"express": "^4.18.0"}, "node"),
+    ], ids=["react", "nextjs", "node"])
+    def test_detect_project_type_package_json(self, tmp_path_factory, deps, expected):
+        """Test detecting React, Next.js and Node.js projects from package.json dependencies."""
+        temp_path = tmp_path_factory.mktemp(expected)
+        _write_pkg(temp_path, deps)
+        
+        assert ConfigManager.detect_project_type(temp_path) == expected
     
-    def test_detect_project_type_unity(self):
+    def test_detect_project_type_unity(self, tmp_path_factory):
         """Test detecting Unity project type."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create Unity project structure
-            (temp_path / "Assets").mkdir()
-            (temp_path / "ProjectSettings").mkdir()
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "unity"
+        temp_path = tmp_path_factory.mktemp("unity")
+        
+        # Create Unity project structure
+        (temp_path / "Assets").mkdir()
+        (temp_path / "ProjectSettings").mkdir()
+        
+        project_type = ConfigManager.detect_project_type(temp_path)
+        assert project_type == "unity"
     
-    def test_detect_project_type_unity_csproj(self):
+    def test_detect_project_type_unity_csproj(self, tmp_path_factory):
         """Test detecting Unity project type with .csproj file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create .csproj file
-            (temp_path / "TestProject.csproj").touch()
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "unity"
+        temp_path = tmp_path_factory.mktemp("unity_csproj")
+        
+        # Create .csproj file
+        (temp_path / "TestProject.csproj").touch()
+        
+        project_type = ConfigManager.detect_project_type(temp_path)
+        assert project_type == "unity"
     
-    def test_detect_project_type_unknown(self):
+    def test_detect_project_type_unknown(self, tmp_path_factory):
         """Test detecting unknown project type."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "unknown"
+        temp_path = tmp_path_factory.mktemp("unknown")
+        
+        project_type = ConfigManager.detect_project_type(temp_path)
+        assert project_type == "unknown"
     
-    def test_detect_project_type_invalid_package_json(self):
+    def test_detect_project_type_invalid_package_json(self, tmp_path_factory):
         """Test handling invalid package.json."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Create invalid package.json
-            with open(temp_path / "package.json", "w") as f:
-                f.write("invalid json content")
-            
-            project_type = ConfigManager.detect_project_type(temp_path)
-            assert project_type == "node"
+        temp_path = tmp_path_factory.mktemp("invalid_package_json")
+        
+        # Create invalid package.json
+        (temp_path / "package.json").write_text("invalid json content")
+        
+        project_type = ConfigManager.detect_project_type(temp_path)
+        assert project_type == "node"
     
     def test_get_ignore_patterns_for_project(self):
         """Test getting ignore patterns for different project types."""
@@ -228,7 +189,17 @@ class TestConfigManager:
         assert "build/**" in react_patterns
         assert "Library/**" in unity_patterns
         assert "Temp/**" in unity_patterns
-        assert unknown_patterns == []
+        assert unknown_patterns == ()
+    
+    def test_get_ignore_patterns_for_project_cached(self):
+        """Test that repeated lookups for a project type reuse the cached patterns."""
+        first = ConfigManager.get_ignore_patterns_for_project("react")
+        hits_before = ConfigManager.get_ignore_patterns_for_project.cache_info().hits
+        second = ConfigManager.get_ignore_patterns_for_project("react")
+        
+        assert first is second
+        assert isinstance(first, tuple)
+        assert ConfigManager.get_ignore_patterns_for_project.cache_info().hits == hits_before + 1
     
     def test_load_config_default(self):
         """Test loading default configuration."""
@@ -240,7 +211,7 @@ class TestConfigManager:
         assert config.output.output_dir == "./reports"
     
     def test_load_config_from_file(self):
-        """Test loading configuration from file."""
+        """Test loading configuration from a JSON stream."""
         config_data = {
             "scan": {
                 "context_lines": 5,
@@ -256,36 +227,40 @@ class TestConfigManager:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            config_path = f.name
-        
-        try:
-            config = ConfigManager.load_config(config_path)
-            
-            assert config.scan.context_lines == 5
-            assert config.scan.file_extensions == [".py", ".js"]
-            assert config.github.base_url == "https://github.com/custom-org"
-            assert config.github.default_branch == "develop"
-            assert config.output.output_dir == "./custom_reports"
-            assert config.output.data_extraction_detailed == True
-        finally:
-            Path(config_path).unlink()
+        config = ConfigManager._load_from_stream(io.StringIO(orjson.dumps(config_data).decode()))
+        
+        assert config.scan.context_lines == 5
+        assert config.scan.file_extensions == [".py", ".js"]
+        assert config.github.base_url == "https://github.com/custom-org"
+        assert config.github.default_branch == "develop"
+        assert config.output.output_dir == "./custom_reports"
+        assert config.output.data_extraction_detailed == True
     
-    def test_load_config_invalid_file(self):
+    def test_load_config_invalid_file(self, tmp_path):
         """Test loading configuration from invalid file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("invalid json")
-            config_path = f.name
-        
-        try:
-            config = ConfigManager.load_config(config_path)
-            
-            # Should return default config
-            assert isinstance(config, AppConfig)
-            assert config.scan.context_lines == 3
-        finally:
-            Path(config_path).unlink()
+        config_path = tmp_path / "cfg.json"
+        config_path.write_text("invalid json")
+        
+        config = ConfigManager.load_config(str(config_path))
+        
+        # Should return default config
+        assert isinstance(config, AppConfig)
+        assert config.scan.context_lines == 3
+    
+    def test_load_config_unknown_key_skipped(self, tmp_path, caplog):
+        """Test an unknown key is logged and skipped without losing valid settings."""
+        config_path = tmp_path / "cfg.json"
+        config_path.write_text(orjson.dumps({
+            "scan": {"context_lines": 7, "contxt_lines": 9},
+            "output": {"output_dir": "./custom_reports"}
+        }).decode())
+        
+        with caplog.at_level(logging.WARNING, logger="config"):
+            config = ConfigManager.load_config(str(config_path))
+        
+        assert config.scan.context_lines == 7
+        assert config.output.output_dir == "./custom_reports"
+        assert "scan.contxt_lines" in caplog.text
     
     def test_load_config_nonexistent_file(self):
         """Test loading configuration from nonexistent file."""
@@ -296,27 +271,31 @@ class TestConfigManager:
         assert config.scan.context_lines == 3
     
     def test_save_config(self):
-        """Test saving configuration to file."""
+        """Test saving configuration as JSON."""
         config = AppConfig()
         config.scan.context_lines = 5
         config.github.default_branch = "develop"
         config.output.data_extraction_detailed = True
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            config_path = f.name
-        
-        try:
-            ConfigManager.save_config(config, config_path)
-            
-            # Read back and verify
-            with open(config_path, 'r') as f:
-                saved_data = json.load(f)
-            
-            assert saved_data['scan']['context_lines'] == 5
-            assert saved_data['github']['default_branch'] == "develop"
-            assert saved_data['output']['data_extraction_detailed'] == True
-        finally:
-            Path(config_path).unlink()
+        buffer = io.StringIO()
+        ConfigManager._save_to_stream(config, buffer)
+        saved_data = orjson.loads(buffer.getvalue())
+        
+        assert saved_data['scan']['context_lines'] == 5
+        assert saved_data['github']['default_branch'] == "develop"
+        assert saved_data['output']['data_extraction_detailed'] == True
+    
+    def test_save_and_load_config_file(self, tmp_path):
+        """Test that a saved configuration file loads back unchanged."""
+        config = AppConfig()
+        config.scan.file_extensions = ['.py', '.js']
+        config.github.default_branch = "develop"
+        config.output.output_dir = "./custom_reports"
+        config_path = tmp_path / "config.json"
+        
+        ConfigManager.save_config(config, str(config_path))
+        
+        assert ConfigManager.load_config(str(config_path)) == config
     
     def test_generate_github_url(self):
         """Test generating GitHub URL for a project."""
@@ -1,21 +1,131 @@
 """Unit tests for datadog_detector.py module."""
 
 import pytest
-from unittest.mock import patch, MagicMock
 
+import datadog_detector
 from datadog_detector import DataDogDetector
 from models import DataDogFinding, DataDogOperationType, DataCategory
 
 
+IMPORT_CASES = (
+    "import { datadogRum } from '@datadog/browser-rum';",
+    "import { datadogLogs } from '@datadog/browser-logs';",
+    "import '@datadog/browser-rum-react';",
+    "const { datadogRum } = require('@datadog/browser-rum');",
+    "from '@datadog/browser-rum' import datadogRum",
+)
+
+RUM_ACTION_CASES = (
+    "datadogRum.addAction('button-click', { userId: '123' });",
+    "DD_RUM.addAction('page-view');",
+    "datadogRum.addAction('form-submit', context);",
+)
+
+RUM_ERROR_CASES = (
+    "datadogRum.addError(new Error('Test error'));",
+    "DD_RUM.addError(error, { context: 'test' });",
+    "datadogRum.addError('Error message');",
+)
+
+LOG_CASES = (
+    ("logger.info('User logged in');", DataDogOperationType.LOG_INFO),
+    ("logger.error('Database connection failed');", DataDogOperationType.LOG_ERROR),
+    ("logger.warn('Deprecated API usage');", DataDogOperationType.LOG_WARN),
+    ("logger.debug('Debug information');", DataDogOperationType.LOG_DEBUG),
+    ("datadogLogs.logger.info('Application started');", DataDogOperationType.LOG_INFO),
+)
+
+INIT_CASES = (
+    """datadogRum.init({
+        applicationId: 'abc123',
+        clientToken: 'def456',
+        site: 'datadoghq.com'
+    });""",
+    "datadogLogs.createLogger({ name: 'test-logger' });",
+    "DD_RUM.init({ applicationId: 'test-app' });",
+)
+
+USER_ACTION_CASES = (
+    "datadogRum.addAction('button-click');",
+    "datadogRum.addAction('user-tap');",
+    "datadogRum.addAction('form-submit');",
+    "datadogRum.addAction('scroll-event');",
+)
+
+SYSTEM_ACTION_CASES = (
+    "datadogRum.addAction('api-call');",
+    "datadogRum.addAction('system-startup');",
+    "datadogRum.addAction('background-process');",
+)
+
+CASE_INSENSITIVE_CASES = (
+    "DATADOGRUM.addAction('test');",
+    "DatadogRum.addAction('test');",
+    "datadogrum.addaction('test');",
+)
+
+_STATS_FINDINGS = (
+    DataDogFinding(
+        file_path="/test/file1.ts",
+        line_number=10,
+        code_snippet="datadogRum.addAction('test1')",
+        operation_type=DataDogOperationType.RUM_ACTION,
+        data_being_sent={},
+        data_category=DataCategory.USER_DATA,
+        context_lines=[],
+        github_url="https://github.com/test/repo",
+        project_name="project1"
+    ),
+    DataDogFinding(
+        file_path="/test/file2.ts",
+        line_number=20,
+        code_snippet="logger.error('test error')",
+        operation_type=DataDogOperationType.LOG_ERROR,
+        data_being_sent={},
+        data_category=DataCategory.ERROR_DATA,
+        context_lines=[],
+        github_url="https://github.com/test/repo",
+        project_name="project1"
+    ),
+    DataDogFinding(
+        file_path="/test/file3.ts",
+        line_number=30,
+        code_snippet="datadogRum.addAction('test2')",
+        operation_type=DataDogOperationType.RUM_ACTION,
+        data_being_sent={},
+        data_category=DataCategory.USER_DATA,
+        context_lines=[],
+        github_url="https://github.com/test/repo",
+        project_name="project2"
+    ),
+)
+
+
+def _not_expected(*args, **kwargs):
+    """Stand-in for detector passes that an early return should skip."""
+    pytest.fail("detection passes ran for content without DataDog keywords")
+
+
+def _detect_batch(detector, cases):
+    """Detect all single-line cases in one file, one finding per case line."""
+    content = "\n".join(f"// case {i}\n{code}" for i, code in enumerate(cases))
+    findings = detector.detect_datadog_usage(
+        "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+    )
+    
+    assert [f.line_number for f in findings] == list(range(2, 2 * len(cases) + 1, 2))
+    return findings
+
+
 class TestDataDogDetector:
     """Test DataDogDetector class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def detector(self):
-        """Create a DataDogDetector instance for testing."""
+        """Create a DataDogDetector instance shared by the read-only tests."""
         return DataDogDetector(context_lines=3, detailed_extraction=False)
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def detailed_detector(self):
         """Create a DataDogDetector instance with detailed extraction."""
         return DataDogDetector(context_lines=3, detailed_extraction=True)
@@ -31,102 +141,68 @@ class TestDataDogDetector:
     
     def test_detect_import_statements(self, detector):
         """Test detecting DataDog import statements."""
-        test_cases = [
-            "import { datadogRum } from '@datadog/browser-rum';",
-            "import { datadogLogs } from '@datadog/browser-logs';",
-            "import '@datadog/browser-rum-react';",
-            "const { datadogRum } = require('@datadog/browser-rum');",
-            "from '@datadog/browser-rum' import datadogRum",
-        ]
-        
-        for code in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].operation_type == DataDogOperationType.IMPORT
-            assert findings[0].data_category == DataCategory.CONFIGURATION_DATA
-            assert code.strip() in findings[0].code_snippet
+        findings = _detect_batch(detector, IMPORT_CASES)
+        
+        for code, finding in zip(IMPORT_CASES, findings):
+            assert finding.operation_type == DataDogOperationType.IMPORT
+            assert finding.data_category == DataCategory.CONFIGURATION_DATA
+            assert code.strip() in finding.code_snippet
     
-    def test_detect_rum_actions(self, detector):
+    def test_pattern_cache_shared(self):
+        """Test that detectors reuse one set of compiled patterns."""
+        first = DataDogDetector(context_lines=3, detailed_extraction=False)
+        second = DataDogDetector(context_lines=5, detailed_extraction=True)
+        
+        assert first.patterns is second.patterns
+        assert datadog_detector._PATTERNS is first.patterns
+    
+    @pytest.mark.parametrize("code", RUM_ACTION_CASES)
+    def test_detect_rum_actions(self, detector, code):
         """Test detecting RUM action calls."""
-        test_cases = [
-            "datadogRum.addAction('button-click', { userId: '123' });",
-            "DD_RUM.addAction('page-view');",
-            "datadogRum.addAction('form-submit', context);",
-        ]
-        
-        for code in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].operation_type == DataDogOperationType.RUM_ACTION
-            assert 'action_name' in findings[0].data_being_sent or 'parameters' in findings[0].data_being_sent
+        content = f"// Test file\n{code}\n// End"
+        findings = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert len(findings) == 1
+        assert findings[0].operation_type == DataDogOperationType.RUM_ACTION
+        assert 'action_name' in findings[0].data_being_sent or 'parameters' in findings[0].data_being_sent
     
-    def test_detect_rum_errors(self, detector):
+    @pytest.mark.parametrize("code", RUM_ERROR_CASES)
+    def test_detect_rum_errors(self, detector, code):
         """Test detecting RUM error calls."""
-        test_cases = [
-            "datadogRum.addError(new Error('Test error'));",
-            "DD_RUM.addError(error, { context: 'test' });",
-            "datadogRum.addError('Error message');",
-        ]
-        
-        for code in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].operation_type == DataDogOperationType.RUM_ERROR
-            assert findings[0].data_category == DataCategory.ERROR_DATA
+        content = f"// Test file\n{code}\n// End"
+        findings = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert len(findings) == 1
+        assert findings[0].operation_type == DataDogOperationType.RUM_ERROR
+        assert findings[0].data_category == DataCategory.ERROR_DATA
     
-    def test_detect_log_statements(self, detector):
+    @pytest.mark.parametrize("code, expected_type", LOG_CASES)
+    def test_detect_log_statements(self, detector, code, expected_type):
         """Test detecting log statements."""
-        test_cases = [
-            ("logger.info('User logged in');", DataDogOperationType.LOG_INFO),
-            ("logger.error('Database connection failed');", DataDogOperationType.LOG_ERROR),
-            ("logger.warn('Deprecated API usage');", DataDogOperationType.LOG_WARN),
-            ("logger.debug('Debug information');", DataDogOperationType.LOG_DEBUG),
-            ("datadogLogs.logger.info('Application started');", DataDogOperationType.LOG_INFO),
-        ]
-        
-        for code, expected_type in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].operation_type == expected_type
-            assert 'log_message' in findings[0].data_being_sent or 'parameters' in findings[0].data_being_sent
+        content = f"// Test file\n{code}\n// End"
+        findings = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert len(findings) == 1
+        assert findings[0].operation_type == expected_type
+        assert 'log_message' in findings[0].data_being_sent or 'parameters' in findings[0].data_being_sent
     
-    def test_detect_initialisation(self, detector):
+    @pytest.mark.parametrize("code", INIT_CASES)
+    def test_detect_initialisation(self, detector, code):
         """Test detecting DataDog initialisation calls."""
-        test_cases = [
-            """datadogRum.init({
-                applicationId: 'abc123',
-                clientToken: 'def456',
-                site: 'datadoghq.com'
-            });""",
-            "datadogLogs.createLogger({ name: 'test-logger' });",
-            "DD_RUM.init({ applicationId: 'test-app' });",
-        ]
-        
-        for code in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) >= 1  # May match multiple lines for multiline code
-            init_finding = next(f for f in findings if f.operation_type == DataDogOperationType.INIT)
-            assert init_finding.data_category == DataCategory.CONFIGURATION_DATA
+        content = f"// Test file\n{code}\n// End"
+        findings = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert len(findings) >= 1  # May match multiple lines for multiline code
+        init_finding = next(f for f in findings if f.operation_type == DataDogOperationType.INIT)
+        assert init_finding.data_category == DataCategory.CONFIGURATION_DATA
     
     def test_context_lines_extraction(self, detector):
         """Test context lines extraction."""
@@ -153,38 +229,15 @@ datadogRum.addAction('test');
     
     def test_data_categorisation_user_actions(self, detector):
         """Test data categorisation for user actions."""
-        user_action_cases = [
-            "datadogRum.addAction('button-click');",
-            "datadogRum.addAction('user-tap');",
-            "datadogRum.addAction('form-submit');",
-            "datadogRum.addAction('scroll-event');",
-        ]
-        
-        for code in user_action_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].data_category == DataCategory.USER_DATA
+        findings = _detect_batch(detector, USER_ACTION_CASES)
+        
+        assert all(f.data_category == DataCategory.USER_DATA for f in findings)
     
     def test_data_categorisation_system_actions(self, detector):
         """Test data categorisation for system actions."""
-        system_action_cases = [
-            "datadogRum.addAction('api-call');",
-            "datadogRum.addAction('system-startup');",
-            "datadogRum.addAction('background-process');",
-        ]
-        
-        for code in system_action_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].data_category == DataCategory.SYSTEM_DATA
+        findings = _detect_batch(detector, SYSTEM_ACTION_CASES)
+        
+        assert all(f.data_category == DataCategory.SYSTEM_DATA for f in findings)
     
     def test_detailed_parameter_extraction(self, detailed_detector):
         """Test detailed parameter extraction."""
@@ -259,72 +312,27 @@ datadogRum.addAction('test');
         assert 'log_message' in data
         assert data['log_message'] == 'User logged in successfully'
     
-    def test_is_datadog_related_file(self, detector):
-        """Test file filtering logic."""
+    @pytest.mark.parametrize("file_path, expected", [
         # Should scan these files
-        valid_files = [
-            "/path/to/app.js",
-            "/path/to/component.jsx",
-            "/path/to/service.ts",
-            "/path/to/utils.tsx",
-            "/path/to/datadog-config.js",
-            "/path/to/analytics.ts",
-        ]
-        
-        for file_path in valid_files:
-            assert detector.is_datadog_related_file(file_path) == True
-        
+        ("/path/to/app.js", True),
+        ("/path/to/component.jsx", True),
+        ("/path/to/service.ts", True),
+        ("/path/to/utils.tsx", True),
+        ("/path/to/datadog-config.js", True),
+        ("/path/to/analytics.ts", True),
         # Should not scan these files
-        invalid_files = [
-            "/path/to/styles.css",
-            "/path/to/image.png",
-            "/path/to/data.json",
-            "/path/to/readme.md",
-        ]
-        
-        for file_path in invalid_files:
-            assert detector.is_datadog_related_file(file_path) == False
+        ("/path/to/styles.css", False),
+        ("/path/to/image.png", False),
+        ("/path/to/data.json", False),
+        ("/path/to/readme.md", False),
+    ])
+    def test_is_datadog_related_file(self, detector, file_path, expected):
+        """Test file filtering logic."""
+        assert detector.is_datadog_related_file(file_path) is expected
     
     def test_get_statistics(self, detector):
         """Test statistics generation."""
-        # Create mock findings
-        findings = [
-            DataDogFinding(
-                file_path="/test/file1.ts",
-                line_number=10,
-                code_snippet="datadogRum.addAction('test1')",
-                operation_type=DataDogOperationType.RUM_ACTION,
-                data_being_sent={},
-                data_category=DataCategory.USER_DATA,
-                context_lines=[],
-                github_url="https://github.com/test/repo",
-                project_name="project1"
-            ),
-            DataDogFinding(
-                file_path="/test/file2.ts",
-                line_number=20,
-                code_snippet="logger.error('test error')",
-                operation_type=DataDogOperationType.LOG_ERROR,
-                data_being_sent={},
-                data_category=DataCategory.ERROR_DATA,
-                context_lines=[],
-                github_url="https://github.com/test/repo",
-                project_name="project1"
-            ),
-            DataDogFinding(
-                file_path="/test/file3.ts",
-                line_number=30,
-                code_snippet="datadogRum.addAction('test2')",
-                operation_type=DataDogOperationType.RUM_ACTION,
-                data_being_sent={},
-                data_category=DataCategory.USER_DATA,
-                context_lines=[],
-                github_url="https://github.com/test/repo",
-                project_name="project2"
-            ),
-        ]
-        
-        stats = detector.get_statistics(findings)
+        stats = detector.get_statistics(list(_STATS_FINDINGS))
         
         assert stats['total_findings'] == 3
         assert stats['by_operation_type']['rum_action'] == 2
@@ -351,33 +359,45 @@ datadogRum.addAction('test');
         assert DataDogOperationType.RUM_ACTION in operation_types
         assert DataDogOperationType.LOG_INFO in operation_types
     
-    def test_case_insensitive_matching(self, detector):
+    @pytest.mark.parametrize("code", CASE_INSENSITIVE_CASES)
+    def test_case_insensitive_matching(self, detector, code):
         """Test case insensitive pattern matching."""
-        test_cases = [
-            "DATADOGRUM.addAction('test');",
-            "DatadogRum.addAction('test');",
-            "datadogrum.addaction('test');",
-        ]
-        
-        for code in test_cases:
-            content = f"// Test file\n{code}\n// End"
-            findings = detector.detect_datadog_usage(
-                "/test/file.ts", content, "test-project", "https://github.com/test/repo"
-            )
-            
-            assert len(findings) == 1
-            assert findings[0].operation_type == DataDogOperationType.RUM_ACTION
+        content = f"// Test file\n{code}\n// End"
+        findings = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert len(findings) == 1
+        assert findings[0].operation_type == DataDogOperationType.RUM_ACTION
     
-    def test_empty_file_content(self, detector):
+    def test_detection_is_stateless(self, detector):
+        """Test that repeated detection returns equal but independent findings."""
+        content = "// Test file\ndatadogRum.addAction('test');\n// End"
+        
+        first = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        second = detector.detect_datadog_usage(
+            "/test/file.ts", content, "test-project", "https://github.com/test/repo"
+        )
+        
+        assert first == second
+        assert first is not second
+        assert first[0] is not second[0]
+    
+    def test_empty_file_content(self, detector, monkeypatch):
         """Test handling empty file content."""
+        monkeypatch.setattr(detector, "_extract_imported_methods", _not_expected)
+        
         findings = detector.detect_datadog_usage(
             "/test/empty.ts", "", "test-project", "https://github.com/test/repo"
         )
         
         assert len(findings) == 0
     
-    def test_file_with_no_matches(self, detector):
-        """Test handling file with no DataDog usage."""
+    def test_file_with_no_matches(self, detector, monkeypatch):
+        """Test handling file with no DataDog usage, which skips the pattern passes."""
+        monkeypatch.setattr(detector, "_extract_imported_methods", _not_expected)
         content = """// This is a regular file
 function add(a, b) {
     return a + b;
@@ -0,0 +1,50 @@
+"""Unit tests for fast_cli.py module."""
+
+import pytest
+
+import fast_cli
+from main import create_argument_parser
+
+
+# Command lines the fast parser must handle exactly like argparse
+SUPPORTED_ARGVS = [
+    ["main.py", "--scan-dir", "/src"],
+    ["main.py", "--scan-dir", "/src", "--verbose", "--dry-run"],
+    ["main.py", "-v", "--scan-dir", "/src", "--output-dir", "./out"],
+    ["main.py", "--scan-dir", "/src", "--data-type", "user-data", "--project", "app"],
+    ["main.py", "--scan-dir", "/src", "--file-extensions", ".ts", ".cs", "--context-lines", "5"],
+    ["main.py", "--ignore-patterns", "*.test.js", "*.spec.ts", "--scan-dir", "/src"],
+    ["main.py", "--scan-dir", "/a", "--scan-dir", "/b", "--extract-data-detailed"],
+    ["main.py", "--scan-dir", "/src", "--github-repo", "https://github.com/org", "--config", "c.json"],
+]
+
+# Command lines that must be left to argparse
+FALLBACK_ARGVS = [
+    ["main.py", "--help"],
+    ["main.py", "-h"],
+    ["main.py"],
+    ["main.py", "--scan-dir"],
+    ["main.py", "--scan-dir", "/src", "--unknown"],
+    ["main.py", "--scan-dir", "/src", "extra"],
+    ["main.py", "--scan-dir", "/src", "--data-type", "bogus"],
+    ["main.py", "--scan-dir", "/src", "--context-lines", "many"],
+    ["main.py", "--scan-dir", "/src", "--file-extensions"],
+    ["main.py", "--scan-dir=/src"],
+    ["main.py", "--scan", "/src"],
+]
+
+
+class TestFastCli:
+    """Test the fast command line parser."""
+
+    @pytest.mark.parametrize("argv", SUPPORTED_ARGVS)
+    def test_matches_argparse(self, argv):
+        """Test that supported command lines parse identically to argparse."""
+        expected = create_argument_parser().parse_args(argv[1:])
+
+        assert vars(fast_cli.parse(argv)) == vars(expected)
+
+    @pytest.mark.parametrize("argv", FALLBACK_ARGVS)
+    def test_falls_back(self, argv):
+        """Test that help, errors and unsupported syntax defer to argparse."""
+        assert fast_cli.parse(argv) is None
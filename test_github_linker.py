@@ -1,11 +1,15 @@
 """Unit tests for github_linker.py module."""
 
+import os
 import pytest
+import shutil
 import subprocess
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from github_linker import GitHubLinker
+from github_linker import GitHubLinker, _GIT_ENV
+
+# A HEAD file pointing at a commit rather than a branch
+_DETACHED_HEAD = "3f786850e387550fdab836ed7e6dc881de23001b\n"
 
 
 class TestGitHubLinker:
@@ -49,13 +53,53 @@ class TestGitHubLinker:
         )
         assert project_name in ["completely", "different", "path"]  # Fallback behavior
     
+    def test_get_project_name_from_path_shares_directory_lookups(self, linker):
+        """Test that files in the same directory reuse one cached project lookup."""
+        GitHubLinker._project_from_dir.cache_clear()
+        
+        for name in ("a.ts", "b.ts", "c.ts"):
+            assert linker.get_project_name_from_path(
+                f"/Users/pratik/dev/ccm/cocomelon-mobile/src/{name}",
+                "/Users/pratik/dev/ccm"
+            ) == "cocomelon-mobile"
+        
+        info = GitHubLinker._project_from_dir.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+    
+    def test_get_project_name_from_path_file_in_root(self, linker):
+        """Test that a file directly under the scan root is named after itself."""
+        assert linker.get_project_name_from_path(
+            "/Users/pratik/dev/ccm/app.ts", "/Users/pratik/dev/ccm"
+        ) == "app.ts"
+    
+    def test_get_project_name_from_path_root_with_separator(self, linker):
+        """Test that a scan root ending in a separator is matched as a prefix."""
+        assert linker.get_project_name_from_path(
+            "/Users/pratik/dev/ccm/cocomelon-mobile/src/app.ts", "/Users/pratik/dev/ccm/"
+        ) == "cocomelon-mobile"
+        assert linker.get_project_name_from_path("/cocomelon-mobile/src/app.ts", "/") == "cocomelon-mobile"
+    
+    def test_relative_scan_root(self, linker):
+        """Test that a relative scan root such as '.' matches relative file paths."""
+        assert linker.get_project_name_from_path("proj/src/components/a.ts", ".") == "proj"
+        assert linker.generate_file_url("proj/src/components/a.ts", 1, ".") == \
+            "https://github.com/Volley-Inc/proj/blob/main/src/components/a.ts#L1"
+        assert linker.generate_file_url(os.path.abspath("proj/src/a.ts"), 1, ".") == \
+            "https://github.com/Volley-Inc/proj/blob/main/src/a.ts#L1"
+    
+    def test_get_project_name_from_path_sibling_prefix(self, linker):
+        """Test that a sibling directory sharing the root's prefix is not treated as inside it."""
+        assert linker.get_project_name_from_path(
+            "/Users/pratik/dev/ccm-old/app/src/app.ts", "/Users/pratik/dev/ccm"
+        ) == "app"
+    
     @patch('subprocess.run')
     def test_get_branch_for_project_current_branch(self, mock_run, linker):
         """Test getting current branch for a project."""
         # Mock successful git command
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="feature-branch\n"
+            stdout=b"feature-branch\n"
         )
         
         branch = linker.get_branch_for_project("/path/to/project")
@@ -68,7 +112,7 @@ class TestGitHubLinker:
             ['git', 'branch', '--show-current'],
             cwd="/path/to/project",
             capture_output=True,
-            text=True,
+            env=_GIT_ENV,
             timeout=5
         )
     
@@ -84,13 +128,101 @@ class TestGitHubLinker:
         # Should not call git command
         mock_run.assert_not_called()
     
+    @patch('subprocess.run')
+    def test_get_branch_for_project_disk_cache(self, mock_run, tmp_path):
+        """Test that a branch persisted by one run is reused by the next without git."""
+        project = tmp_path / "project"
+        (project / ".git").mkdir(parents=True)
+        # Detached, so the branch has to come from git rather than HEAD itself
+        (project / ".git" / "HEAD").write_text(_DETACHED_HEAD)
+        cache_path = str(tmp_path / "branches.json")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"feature-branch\n")
+        
+        first = GitHubLinker(branch_cache_path=cache_path)
+        assert first.get_branch_for_project(str(project)) == "feature-branch"
+        assert mock_run.call_count == 1
+        
+        second = GitHubLinker(branch_cache_path=cache_path)
+        assert second.get_branch_for_project(str(project)) == "feature-branch"
+        assert mock_run.call_count == 1
+    
+    @patch('subprocess.run')
+    def test_get_branch_for_project_disk_cache_invalidated(self, mock_run, tmp_path):
+        """Test that a changed .git/HEAD mtime bypasses the persisted branch."""
+        project = tmp_path / "project"
+        (project / ".git").mkdir(parents=True)
+        head = project / ".git" / "HEAD"
+        head.write_text(_DETACHED_HEAD)
+        cache_path = str(tmp_path / "branches.json")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"feature-branch\n")
+        GitHubLinker(branch_cache_path=cache_path).get_branch_for_project(str(project))
+        
+        os.utime(head, (0, 0))
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"develop\n")
+        
+        branch = GitHubLinker(branch_cache_path=cache_path).get_branch_for_project(str(project))
+        
+        assert branch == "develop"
+        assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_get_branch_for_project_reads_head(self, mock_run, linker, tmp_path):
+        """Test that a branch checked out in .git/HEAD is read without running git."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/feature/login\n")
+        
+        assert linker.get_branch_for_project(str(tmp_path)) == "feature/login"
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_get_branch_for_project_detached_head(self, mock_run, linker, tmp_path):
+        """Test that a detached HEAD falls back to asking git."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text(_DETACHED_HEAD)
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout=b"\n"),
+            MagicMock(returncode=0, stdout=b"refs/remotes/origin/develop\n")
+        ]
+        
+        assert linker.get_branch_for_project(str(tmp_path)) == "develop"
+        assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_get_branch_for_project_shared_repository(self, mock_run, linker, tmp_path):
+        """Test that projects inside one repository share a single git lookup."""
+        (tmp_path / ".git").mkdir()
+        for name in ("web", "api"):
+            (tmp_path / "packages" / name).mkdir(parents=True)
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"feature-branch\n")
+        
+        assert linker.get_branch_for_project(str(tmp_path / "packages" / "web")) == "feature-branch"
+        assert linker.get_branch_for_project(str(tmp_path / "packages" / "api")) == "feature-branch"
+        assert mock_run.call_count == 1
+        assert linker._branch_cache[str(tmp_path / "packages" / "api")] == "feature-branch"
+    
+    @patch('subprocess.run')
+    def test_prefetch_branches(self, mock_run, linker, tmp_path):
+        """Test that prefetching fills the cache with one git lookup per repository."""
+        paths = []
+        for repo in ("repo-a", "repo-b"):
+            (tmp_path / repo / ".git").mkdir(parents=True)
+            for name in ("web", "api"):
+                (tmp_path / repo / name).mkdir()
+                paths.append(str(tmp_path / repo / name))
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"feature-branch\n")
+        
+        linker.prefetch_branches(paths)
+        
+        assert mock_run.call_count == 2
+        assert all(linker._branch_cache[path] == "feature-branch" for path in paths)
+    
     @patch('subprocess.run')
     def test_get_branch_for_project_fallback_to_remote(self, mock_run, linker):
         """Test falling back to remote branch when current branch fails."""
         # Mock first command failure, second command success
         mock_run.side_effect = [
-            MagicMock(returncode=1, stdout=""),  # git branch --show-current fails
-            MagicMock(returncode=0, stdout="refs/remotes/origin/develop\n")  # git symbolic-ref succeeds
+            MagicMock(returncode=1, stdout=b""),  # git branch --show-current fails
+            MagicMock(returncode=0, stdout=b"refs/remotes/origin/develop\n")  # git symbolic-ref succeeds
         ]
         
         branch = linker.get_branch_for_project("/path/to/project")
@@ -103,8 +235,8 @@ class TestGitHubLinker:
         """Test falling back to default branch when all git commands fail."""
         # Mock all git commands failing
         mock_run.side_effect = [
-            MagicMock(returncode=1, stdout=""),  # git branch --show-current fails
-            MagicMock(returncode=1, stdout="")   # git symbolic-ref fails
+            MagicMock(returncode=1, stdout=b""),  # git branch --show-current fails
+            MagicMock(returncode=1, stdout=b"")   # git symbolic-ref fails
         ]
         
         branch = linker.get_branch_for_project("/path/to/project")
@@ -159,7 +291,7 @@ class TestGitHubLinker:
         # Mock git command to return specific branch
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="feature-branch\n"
+            stdout=b"feature-branch\n"
         )
         
         url = linker.generate_file_url(
@@ -183,6 +315,21 @@ class TestGitHubLinker:
         expected = "https://github.com/Volley-Inc/cocomelon-mobile/blob/main/src/app.ts"
         assert url == expected
     
+    def test_generate_file_url_reuses_prefix(self, linker):
+        """Test that files in the same project and branch share one cached URL prefix."""
+        urls = [
+            linker.generate_file_url(f"/Users/pratik/dev/ccm/cocomelon-mobile/src/{name}", 1, "/Users/pratik/dev/ccm")
+            for name in ("a.ts", "b.ts")
+        ]
+        
+        assert urls == [
+            "https://github.com/Volley-Inc/cocomelon-mobile/blob/main/src/a.ts#L1",
+            "https://github.com/Volley-Inc/cocomelon-mobile/blob/main/src/b.ts#L1",
+        ]
+        assert linker._url_prefix_cache == {
+            ("cocomelon-mobile", "main"): "https://github.com/Volley-Inc/cocomelon-mobile/blob/main/"
+        }
+    
     def test_generate_file_url_invalid_path(self, linker):
         """Test generating GitHub URL with invalid path."""
         url = linker.generate_file_url(
@@ -219,7 +366,9 @@ class TestGitHubLinker:
             "not-a-url",
             "https://gitlab.com/user/repo",
             "ftp://github.com/user/repo",
-            ""
+            "https://github.com.example.org/user/repo",
+            "",
+            None
         ]
         
         for url in invalid_urls:
@@ -230,9 +379,9 @@ class TestGitHubLinker:
         """Test getting repository information."""
         # Mock git commands
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout="feature-branch\n"),  # branch
-            MagicMock(returncode=0, stdout="https://github.com/Volley-Inc/test-repo.git\n"),  # remote
-            MagicMock(returncode=0, stdout="abcdef1234567890abcdef1234567890abcdef12\n")  # commit
+            MagicMock(returncode=0, stdout=b"feature-branch\n"),  # branch
+            MagicMock(returncode=0, stdout=b"https://github.com/Volley-Inc/test-repo.git\n"),  # remote
+            MagicMock(returncode=0, stdout=b"abcdef1234567890abcdef1234567890abcdef12\n")  # commit
         ]
         
         info = linker.get_repository_info("/path/to/project")
@@ -240,15 +389,17 @@ class TestGitHubLinker:
         assert info['branch'] == "feature-branch"
         assert info['remote_url'] == "https://github.com/Volley-Inc/test-repo.git"
         assert info['commit_hash'] == "abcdef1"  # Should be truncated to 7 chars
+        assert mock_run.call_count == 3
+        assert all(call.args[0][0] == 'git' for call in mock_run.call_args_list)
     
     @patch('subprocess.run')
     def test_get_repository_info_partial_failure(self, mock_run, linker):
         """Test getting repository information with partial command failures."""
         # Mock git commands with some failures
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout="feature-branch\n"),  # branch succeeds
-            MagicMock(returncode=1, stdout=""),  # remote fails
-            MagicMock(returncode=0, stdout="abcdef1234567890abcdef1234567890abcdef12\n")  # commit succeeds
+            MagicMock(returncode=0, stdout=b"feature-branch\n"),  # branch succeeds
+            MagicMock(returncode=2, stdout=b""),  # remote fails
+            MagicMock(returncode=0, stdout=b"abcdef1234567890abcdef1234567890abcdef12\n")  # commit succeeds
         ]
         
         info = linker.get_repository_info("/path/to/project")
@@ -257,6 +408,27 @@ class TestGitHubLinker:
         assert info['remote_url'] is None
         assert info['commit_hash'] == "abcdef1"
     
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+    def test_get_repository_info_real_repo(self, linker, tmp_path):
+        """Test the remote and commit lookups against a real repository."""
+        git = ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com']
+        subprocess.run(git + ['init', '-q'], cwd=tmp_path, check=True)
+        
+        # No remote and no commits yet
+        info = linker.get_repository_info(str(tmp_path))
+        assert info['remote_url'] is None
+        assert info['commit_hash'] is None
+        
+        subprocess.run(git + ['commit', '-q', '--allow-empty', '-m', 'init'], cwd=tmp_path, check=True)
+        subprocess.run(git + ['remote', 'add', 'origin', 'https://github.com/Volley-Inc/test-repo.git'],
+                       cwd=tmp_path, check=True)
+        head = subprocess.run(git + ['rev-parse', 'HEAD'], cwd=tmp_path, check=True,
+                              capture_output=True, text=True).stdout.strip()
+        
+        info = linker.get_repository_info(str(tmp_path))
+        assert info['remote_url'] == "https://github.com/Volley-Inc/test-repo.git"
+        assert info['commit_hash'] == head[:7]
+    
     @patch('subprocess.run')
     def test_get_repository_info_all_failures(self, mock_run, linker):
         """Test getting repository information with all command failures."""
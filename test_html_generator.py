@@ -0,0 +1,185 @@
+"""Unit tests for html_generator.py module."""
+
+import csv
+import io
+import json
+import re
+
+import pytest
+
+from html_generator import HtmlGenerator, _csv_esc
+from models import (
+    DataDogOperationType, DataCategory, DataDogFinding,
+    ProjectInfo, ScanResults
+)
+
+
+def _make_finding(code_snippet, data_being_sent, file_path="/repo/app/src/logger.ts"):
+    """Build a finding with the given snippet and payload."""
+    return DataDogFinding(
+        file_path=file_path,
+        line_number=12,
+        code_snippet=code_snippet,
+        operation_type=DataDogOperationType.LOG_INFO,
+        data_being_sent=data_being_sent,
+        data_category=DataCategory.USER_DATA,
+        context_lines=["const a = 1;", code_snippet],
+        github_url="https://github.com/Volley-Inc/app/blob/main/src/logger.ts#L12",
+        project_name="app"
+    )
+
+
+class TestCsvExport:
+    """Test the hand-formatted CSV export."""
+
+    @pytest.mark.parametrize("value", [
+        "plain",
+        "",
+        "with,comma",
+        'with "quotes"',
+        "multi\nline",
+        "carriage\rreturn",
+        ' leading space',
+    ])
+    def test_csv_esc_matches_csv_module(self, value):
+        """Test that field escaping matches csv.writer's minimal quoting."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow([value, "x"])
+        assert f"{_csv_esc(value)},x\r\n" == buffer.getvalue()
+
+    def test_export_matches_csv_module(self, tmp_path):
+        """Test that the exported file round-trips through csv.reader."""
+        findings = [
+            _make_finding('logger.info("a, b")', {"message": "a, b"}),
+            _make_finding("datadogLogs.init({\n  site })", {}),
+            _make_finding("DD_RUM.addAction('click')", {"name": 'say "hi"'}),
+        ]
+        results = ScanResults(
+            projects=[ProjectInfo("app", "/repo/app", "react", "https://github.com/Volley-Inc/app")],
+            findings=findings,
+            total_files_scanned=3,
+            scan_duration=0.1
+        )
+        generator = HtmlGenerator(str(tmp_path))
+
+        generator._generate_csv_export(generator._build_columns(results.findings))
+
+        with open(tmp_path / "datadog_findings.csv", newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0][0] == "Project"
+        assert len(rows) == len(findings) + 1
+        for row, finding in zip(rows[1:], findings):
+            assert row[1] == finding.file_path
+            assert row[2] == str(finding.line_number)
+            assert row[5] == finding.code_snippet
+            assert row[7] == finding.github_url
+
+
+class TestTemplateCache:
+    """Test compiled template reuse."""
+
+    def test_template_compiled_once(self, tmp_path):
+        """Test that generators share a single compiled template."""
+        first = HtmlGenerator(str(tmp_path / "a"))
+        second = HtmlGenerator(str(tmp_path / "b"))
+
+        assert first._get_compiled_template() is second._get_compiled_template()
+
+
+class TestReportEscaping:
+    """Test HTML escaping in the rendered report."""
+
+    def test_code_is_escaped(self, tmp_path):
+        """Test that markup inside code snippets is rendered as text."""
+        finding = _make_finding("logger.info('<script>alert(1)</script>')", {})
+        results = ScanResults(
+            projects=[ProjectInfo("app", "/repo/app", "react", "https://github.com/Volley-Inc/app")],
+            findings=[finding],
+            total_files_scanned=1,
+            scan_duration=0.1
+        )
+
+        report_path = HtmlGenerator(str(tmp_path)).generate_report(results)
+
+        with open(report_path, encoding='utf-8') as f:
+            html = f.read()
+
+        assert "<script>alert(1)</script>" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+
+
+class TestStatistics:
+    """Test report statistics."""
+
+    def test_compute_statistics(self, tmp_path):
+        """Test that one pass counts findings per project, category, operation and file."""
+        findings = [
+            _make_finding("logger.info('a')", {}),
+            _make_finding("logger.info('b')", {}),
+            _make_finding("logger.info('c')", {}, file_path="/repo/web/src/c.ts"),
+        ]
+        findings[2].project_name = "web"
+        findings[2].data_category = DataCategory.ERROR_DATA
+        generator = HtmlGenerator(str(tmp_path))
+
+        stats = generator._compute_statistics(generator._build_columns(findings))
+
+        assert stats == {
+            'total_findings': 3,
+            'by_project': {"app": 2, "web": 1},
+            'by_category': {"user_data": 2, "error_data": 1},
+            'by_operation': {"log_info": 3},
+            'files_with_datadog': 2,
+        }
+
+
+class TestFindingsIndex:
+    """Test the findings index used by the report's JS filter."""
+
+    def test_index_only_covers_rendered_findings(self, tmp_path):
+        """Test that findings of projects missing from the report are left out of the index."""
+        results = ScanResults(
+            projects=[ProjectInfo("app", "/repo/app", "react", "https://github.com/Volley-Inc/app")],
+            findings=[
+                _make_finding("logger.info('a')", {}),
+                _make_finding("logger.info('b')", {}, file_path="/repo/other/src/b.ts"),
+            ],
+            total_files_scanned=2,
+            scan_duration=0.1
+        )
+        results.findings[1].project_name = "other"
+
+        report_path = HtmlGenerator(str(tmp_path)).generate_report(results)
+
+        with open(report_path, encoding='utf-8') as f:
+            html = f.read()
+        index_json = re.search(r'<script id="findings-index" type="application/json">(.*?)</script>', html).group(1)
+        indexed = [
+            position
+            for categories in json.loads(index_json).values()
+            for operations in categories.values()
+            for positions in operations.values()
+            for position in positions
+        ]
+        rendered = [int(i) for i in re.findall(r'data-index="(\d+)"', html)]
+
+        assert indexed == rendered == [0]
+
+
+class TestEmptyReport:
+    """Test report generation for scans without findings."""
+
+    def test_empty_results(self, tmp_path):
+        """Test that an empty scan writes a static report and header-only exports."""
+        results = ScanResults(projects=[], findings=[], total_files_scanned=4, scan_duration=0.5)
+
+        report_path = HtmlGenerator(str(tmp_path)).generate_report(results, title="Empty <Scan>")
+
+        with open(report_path, encoding='utf-8') as f:
+            html = f.read()
+
+        assert "Empty &lt;Scan&gt;" in html
+        assert "4 files scanned" in html
+        assert (tmp_path / "datadog_findings.csv").read_text(encoding='utf-8').startswith("Project,")
+        assert (tmp_path / "datadog_findings.json").exists()
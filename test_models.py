@@ -1,12 +1,13 @@
 """Unit tests for models.py module."""
 
+import sys
 import pytest
-from dataclasses import dataclass
-from typing import List
+from dataclasses import replace
+from pathlib import Path
 
 from models import (
     DataDogOperationType, DataCategory, DataDogFinding, 
-    ProjectInfo, ScanResults
+    ProjectInfo, ScanResults, json_default, OPERATION_VALUES, CATEGORY_VALUES
 )
 
 
@@ -21,10 +22,11 @@ class TestDataDogOperationType:
             "log_debug", "custom_attribute", "configuration"
         ]
         
-        actual_values = [op.value for op in DataDogOperationType]
-        
-        for expected in expected_values:
-            assert expected in actual_values
+        assert set(OPERATION_VALUES.values()) >= set(expected_values)
+    
+    def test_values_lookup(self):
+        """Test that OPERATION_VALUES maps every member to its value."""
+        assert OPERATION_VALUES == {op: op.value for op in DataDogOperationType}
     
     def test_enum_uniqueness(self):
         """Test that all enum values are unique."""
@@ -42,10 +44,11 @@ class TestDataCategory:
             "performance_data", "configuration_data", "unknown"
         ]
         
-        actual_values = [cat.value for cat in DataCategory]
-        
-        for expected in expected_values:
-            assert expected in actual_values
+        assert set(CATEGORY_VALUES.values()) >= set(expected_values)
+    
+    def test_values_lookup(self):
+        """Test that CATEGORY_VALUES maps every member to its value."""
+        assert CATEGORY_VALUES == {cat: cat.value for cat in DataCategory}
     
     def test_enum_uniqueness(self):
         """Test that all enum values are unique."""
@@ -93,6 +96,17 @@ class TestDataDogFinding:
         assert result["data_being_sent"] == {"action_name": "test"}
         assert result["extracted_parameters"] == {"param1": "value1"}
     
+    @pytest.mark.parametrize("operation_type, data_category", list(zip(
+        DataDogOperationType,
+        list(DataCategory) * 2
+    )))
+    def test_to_dict_enum_values(self, sample_finding, operation_type, data_category):
+        """Test that every enum member serialises to its value via the lookup tables."""
+        result = replace(sample_finding, operation_type=operation_type, data_category=data_category).to_dict()
+        
+        assert result["operation_type"] == operation_type.value
+        assert result["data_category"] == data_category.value
+    
     def test_to_dict_with_none_parameters(self):
         """Test to_dict with None extracted_parameters."""
         finding = DataDogFinding(
@@ -111,6 +125,26 @@ class TestDataDogFinding:
         result = finding.to_dict()
         assert result["extracted_parameters"] is None
     
+    def test_project_name_interned(self):
+        """Test that project names are interned on construction."""
+        findings = [
+            DataDogFinding(
+                file_path="/test/file.ts",
+                line_number=1,
+                code_snippet="test",
+                operation_type=DataDogOperationType.IMPORT,
+                data_being_sent={},
+                data_category=DataCategory.UNKNOWN,
+                context_lines=[],
+                github_url="https://github.com/test/repo",
+                project_name="".join(["test-", "project"])
+            )
+            for _ in range(2)
+        ]
+        
+        assert findings[0].project_name is findings[1].project_name
+        assert findings[0].project_name is sys.intern("test-project")
+    
     def test_required_fields(self):
         """Test that required fields are enforced."""
         # This will work because dataclasses don't enforce required fields at runtime
@@ -278,6 +312,21 @@ class TestScanResults:
         assert result["total_files_scanned"] == 100
         assert result["scan_duration"] == 5.5
     
+    def test_orjson_matches_to_dict(self, sample_scan_results):
+        """Test that direct orjson encoding matches the to_dict output."""
+        orjson = pytest.importorskip("orjson")
+        
+        direct = orjson.dumps(sample_scan_results, default=json_default)
+        
+        assert orjson.loads(direct) == orjson.loads(orjson.dumps(sample_scan_results.to_dict()))
+    
+    def test_json_default(self):
+        """Test encoding of values orjson does not handle natively."""
+        assert json_default({"b", "a"}) == ["a", "b"]
+        assert json_default(Path("src/app.ts")) == str(Path("src/app.ts"))
+        with pytest.raises(TypeError):
+            json_default(object())
+    
     def test_get_findings_by_project(self, sample_scan_results):
         """Test get_findings_by_project method."""
         project1_findings = sample_scan_results.get_findings_by_project("project1")
@@ -335,6 +384,56 @@ class TestScanResults:
         for finding in log_info_findings:
             assert finding.operation_type == DataDogOperationType.LOG_INFO
     
+    def test_findings_index_tracks_changes(self, sample_scan_results, sample_findings):
+        """Test that the lookup indexes follow appends and reassignment of findings."""
+        assert len(sample_scan_results.get_findings_by_project("project2")) == 1
+        
+        sample_scan_results.findings.append(replace(sample_findings[0], project_name="project2"))
+        assert len(sample_scan_results.get_findings_by_project("project2")) == 2
+        
+        sample_scan_results.findings = sample_findings[:1]
+        assert sample_scan_results.get_findings_by_project("project2") == []
+        assert sample_scan_results.count_by_category() == {DataCategory.USER_DATA: 1}
+    
+    def test_findings_lookup_follows_item_replacement(self, sample_scan_results, sample_findings):
+        """Test that replacing a finding in place is reflected by the next lookup."""
+        sample_scan_results.findings[0] = replace(sample_findings[0], project_name="project3")
+        
+        assert len(sample_scan_results.get_findings_by_project("project1")) == 1
+        assert len(sample_scan_results.get_findings_by_project("project3")) == 1
+    
+    def test_findings_lookup_returns_copy(self, sample_scan_results):
+        """Test that mutating a lookup result leaves the index intact."""
+        sample_scan_results.get_findings_by_project("project1").clear()
+        
+        assert len(sample_scan_results.get_findings_by_project("project1")) == 2
+    
+    def test_count_by_category(self, sample_scan_results):
+        """Test count_by_category method."""
+        assert sample_scan_results.count_by_category() == {
+            DataCategory.USER_DATA: 1,
+            DataCategory.ERROR_DATA: 1,
+            DataCategory.SYSTEM_DATA: 1,
+        }
+    
+    def test_projects_by_name(self, sample_scan_results, sample_projects):
+        """Test that projects_by_name follows list changes and renamed projects."""
+        assert sample_scan_results.projects_by_name["project2"] is sample_projects[1]
+        
+        sample_scan_results.projects = sample_projects[:1]
+        assert "project2" not in sample_scan_results.projects_by_name
+        
+        sample_projects[0].name = "renamed"
+        assert list(sample_scan_results.projects_by_name) == ["renamed"]
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+    def test_models_use_slots(self, sample_scan_results):
+        """Test that model instances carry no per-instance __dict__."""
+        for obj in (sample_scan_results, sample_scan_results.projects[0], sample_scan_results.findings[0]):
+            assert not hasattr(obj, '__dict__')
+            with pytest.raises(AttributeError):
+                obj.unexpected_attribute = True
+    
     def test_empty_scan_results(self):
         """Test ScanResults with empty data."""
         empty_results = ScanResults(
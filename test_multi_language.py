@@ -4,12 +4,19 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from detectors.detector_factory import DataDogDetectorFactory
+from detectors.detector_factory import DataDogDetectorFactory, get_factory
+
+@pytest.fixture(scope="module")
+def factory():
+    """One detector factory shared by every test in this module."""
+    return DataDogDetectorFactory()
 
-def test_typescript_detection():
+def test_typescript_detection(factory):
     """Test TypeScript detection."""
     print("=== Testing TypeScript Detection ===")
     
@@ -30,7 +37,6 @@ datadogRum.addAction('button-click', { buttonId: 'submit' });
 datadogLogs.logger.info('User clicked submit', { userId: 123 });
 '''
     
-    factory = DataDogDetectorFactory()
     detector = factory.get_detector_for_file('test.ts')
     
     if detector:
@@ -45,7 +51,7 @@ datadogLogs.logger.info('User clicked submit', { userId: 123 });
     
     print()
 
-def test_csharp_detection():
+def test_csharp_detection(factory):
     """Test C# detection."""
     print("=== Testing C# Detection ===")
     
@@ -67,7 +73,6 @@ public class TestClass
 }
 '''
     
-    factory = DataDogDetectorFactory()
     detector = factory.get_detector_for_file('Test.cs')
     
     if detector:
@@ -82,12 +87,10 @@ public class TestClass
     
     print()
 
-def test_detector_info():
+def test_detector_info(factory):
     """Test detector information."""
     print("=== Detector Information ===")
     
-    factory = DataDogDetectorFactory()
-    
     print("Supported extensions:", factory.get_supported_extensions())
     print("\nAvailable detectors:")
     for info in factory.get_detector_info():
@@ -95,8 +98,62 @@ def test_detector_info():
     
     print()
 
-if __name__ == "__main__":
-    test_detector_info()
-    test_typescript_detection() 
-    test_csharp_detection()
-    print("✅ Multi-language detection testing complete!")
\ No newline at end of file
+def test_factory_lookup():
+    """Test the shared factory and its extension lookup."""
+    factory = get_factory()
+    
+    assert get_factory() is factory
+    assert get_factory(context_lines=5) is not factory
+    assert factory.get_detector_for_file('src/App.TSX').get_language_name() == "TypeScript/JavaScript"
+    assert factory.get_detector_for_file('Assets/Player.cs').get_language_name() == "C#"
+    assert factory.get_detector_for_file('styles.css') is None
+    
+    # Same answers as asking each detector in registration order
+    fresh = DataDogDetectorFactory()
+    for path in ['a.ts', 'a.js', 'a.jsx', 'B.CS', 'README', '.ts', 'archive.tar.gz']:
+        expected = next((d for d in fresh.detectors if d.can_handle_file(path)), None)
+        actual = fresh.get_detector_for_file(path)
+        assert (actual and actual.get_language_name()) == (expected and expected.get_language_name())
+
+@pytest.mark.parametrize("path, code", [
+    ('app.ts', "import { datadogRum } from '@datadog/browser-rum';\n\ndatadogRum.addAction('click', { id: 1 });\n"),
+    ('Test.cs', "using Datadog.Unity;\n\nDatadogSdk.Instance.Rum.StartAction(RumUserActionType.Tap, \"Button\");\n"),
+], ids=["typescript", "csharp"])
+def test_presplit_lines(factory, path, code):
+    """Test that passing pre-split lines gives the same findings as splitting internally."""
+    detector = factory.get_detector_for_file(path)
+    
+    expected = detector.detect_datadog_usage(path, code, 'project', 'https://github.com/test/repo')
+    actual = detector.detect_datadog_usage(
+        path, code, 'project', 'https://github.com/test/repo', lines=code.split('\n')
+    )
+    
+    assert expected
+    assert [f.to_dict() for f in actual] == [f.to_dict() for f in expected]
+
+def test_patterns_shared_between_factories(factory):
+    """Test that separately built detectors reuse the module-level compiled patterns."""
+    other = DataDogDetectorFactory(context_lines=5)
+    
+    for first, second in zip(factory.detectors, other.detectors):
+        assert first.patterns is second.patterns
+
+def test_parallel_detection(factory):
+    """Test that the process pool returns the same findings, in order, as serial detection."""
+    tasks = [
+        ('app.ts', "import { datadogRum } from '@datadog/browser-rum';\ndatadogRum.addAction('click');\n"),
+        ('README.md', "datadogRum.addAction('click');\n"),
+        ('Test.cs', "using Datadog.Unity;\nlogger.Info(\"Test message\");\n"),
+        ('plain.js', "console.log('no datadog here');\n"),
+    ]
+    tasks = [(path, code, 'project', 'https://github.com/test/repo') for path, code in tasks]
+    
+    serial = []
+    for task in tasks:
+        detector = factory.get_detector_for_file(task[0])
+        serial.append(detector.detect_datadog_usage(*task) if detector else [])
+    parallel = factory.detect_in_processes(tasks, max_workers=2, chunksize=1)
+    
+    assert any(serial)
+    assert [[f.to_dict() for f in findings] for findings in parallel] == \
+        [[f.to_dict() for f in findings] for findings in serial]